@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+activity.py — compact per-day activity counts and the stats derived from them.
+
+A DailySeries is one contiguous array('I') of counts, index 0 = `start` day,
+one slot per UTC day. All stats are computed with whole-array operations
+(tail slices for the 7/30/365-day totals, strided slices, bytes.split on a
+nonzero mask) rather than per-day Python loops, so multi-year histories stay
+cheap. A series is built from the merged calendar on every run; at a few
+thousand days that is a single pass and there is nothing to keep in sync.
+
+Serialized form (what goes into data.json):
+  {"start": "YYYY-MM-DD", "days": N, "counts": base64(zlib(uint32 LE array))}
+"""
+
+import base64
+import bisect
+import sys
+import zlib
+from array import array
+from datetime import date, timedelta
+
+TYPECODE = "I" if array("I").itemsize == 4 else "L"
+EPOCH    = date(1970, 1, 1)
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def epoch_day(d):
+    return (d - EPOCH).days
+
+
+class DailySeries:
+    def __init__(self, start, counts=None):
+        self.start  = start
+        self.counts = counts if counts is not None else array(TYPECODE)
+
+    # ── building ──────────────────────────────────────────────────────────────
+    @classmethod
+    def from_calendar(cls, calendar, end=None):
+        """From LeetCode's {epoch-seconds: count} calendar, padded up to `end`."""
+        days = {int(ts) // 86400: int(c) for ts, c in calendar.items()}
+        end_day = epoch_day(end) if end else max(days, default=epoch_day(date.today()))
+        first = min(days, default=end_day)
+        counts = array(TYPECODE, bytes(array(TYPECODE).itemsize * (end_day - first + 1)))
+        for d, c in days.items():
+            if first <= d <= end_day:
+                counts[d - first] += c
+        return cls(EPOCH + timedelta(days=first), counts)
+
+    @property
+    def end(self):
+        return self.start + timedelta(days=len(self.counts) - 1)
+
+    def set(self, day, count):
+        """Set one day's count, growing the array with zero days if needed
+        (svg_cards pads a short series out to a full heatmap this way)."""
+        i = (day - self.start).days
+        if i < 0:
+            self.counts[0:0] = array(TYPECODE, bytes(self.counts.itemsize * -i))
+            self.start, i = day, 0
+        if i >= len(self.counts):
+            self.counts.extend(array(TYPECODE, bytes(self.counts.itemsize * (i - len(self.counts) + 1))))
+        self.counts[i] = count
+
+    # ── stats ─────────────────────────────────────────────────────────────────
+    def window(self, k):
+        """Sum over the last k days of the series."""
+        return sum(self.counts[-k:]) if k > 0 else 0
+
+    def _mask(self):
+        return bytes(map(bool, self.counts))
+
+    def streaks(self):
+        """(current, longest) runs of consecutive active days.
+
+        The current streak still counts if today has no activity yet but
+        yesterday did — the day is not over.
+        """
+        mask = self._mask()
+        longest = max(map(len, mask.split(b"\x00")), default=0)
+        trimmed = mask[:-1] if mask.endswith(b"\x00") else mask
+        current = len(trimmed) - len(trimmed.rstrip(b"\x01"))
+        return current, longest
+
+    def weekday_histogram(self):
+        """Total count per weekday, Monday first."""
+        first = (epoch_day(self.start) + 3) % 7         # 1970-01-01 was a Thursday
+        hist = [0] * 7
+        for wd in range(7):
+            hist[wd] = sum(self.counts[(wd - first) % 7::7])
+        return hist
+
+    def weeks(self, n_weeks=53):
+        """Last n_weeks as Monday-first columns of 7 counts (None = outside series).
+
+        The last column is the current (possibly partial) week.
+        """
+        end_wd = (epoch_day(self.end) + 3) % 7
+        total  = n_weeks * 7
+        tail   = list(self.counts[-(total - (6 - end_wd)):]) + [None] * (6 - end_wd)
+        tail   = [None] * (total - len(tail)) + tail
+        return [tail[i:i + 7] for i in range(0, total, 7)]
+
+    def levels(self, n_levels=4):
+        """Quantile thresholds splitting nonzero days into n_levels buckets."""
+        nz = sorted(c for c in self.counts if c)
+        if not nz:
+            return []
+        return [nz[min(len(nz) - 1, len(nz) * q // n_levels)] for q in range(1, n_levels)]
+
+    def level_weeks(self, n_weeks=53, n_levels=4):
+        """weeks() as intensity levels: one bytes object per column, 0xFF
+        for days outside the series. Quantiles come from the shown window only.
+
+        Returns (columns, thresholds).
+        """
+        shown = DailySeries(self.start, self.counts[-n_weeks * 7:])
+        thresholds = shown.levels(n_levels)
+        flat = bytes(0xFF if c is None else self.level(c, thresholds)
+                     for col in self.weeks(n_weeks) for c in col)
+        return [flat[i:i + 7] for i in range(0, len(flat), 7)], thresholds
+
+    @staticmethod
+    def level(count, thresholds):
+        """Intensity 0..len(thresholds)+1 for one count (0 = no activity)."""
+        if not count:
+            return 0
+        return 1 + bisect.bisect_right(thresholds, count - 1)
+
+    def stats(self):
+        current, longest = self.streaks()
+        return {
+            "currentStreak": current,
+            "longestStreak": longest,
+            "activeDays":    len(self.counts) - self._mask().count(0),
+            "last7":         self.window(7),
+            "last30":        self.window(30),
+            "last365":       self.window(365),
+            "weekdays":      dict(zip(WEEKDAYS, self.weekday_histogram())),
+        }
+
+    # ── serialization ─────────────────────────────────────────────────────────
+    def to_dict(self):
+        raw = self.counts
+        if sys.byteorder == "big":
+            raw = array(TYPECODE, raw)
+            raw.byteswap()
+        return {"start": self.start.isoformat(), "days": len(self.counts),
+                "counts": base64.b64encode(zlib.compress(raw.tobytes(), 9)).decode()}
+
+    @classmethod
+    def from_dict(cls, d):
+        counts = array(TYPECODE)
+        counts.frombytes(zlib.decompress(base64.b64decode(d["counts"])))
+        if sys.byteorder == "big":
+            counts.byteswap()
+        return cls(date.fromisoformat(d["start"]), counts)
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+bench.py — end-to-end refresh benchmarks against a synthetic stand-in API.
+
+Each case runs one of the real entry points (fetch_data.py, build_dashboard.py,
+render_svg.py) as a subprocess in a scratch directory, with HTTP_BASE_OVERRIDE
+pointing at an in-process standin_server whose responder generates data at a
+chosen scale: task issues, years of LeetCode calendar, Monkeytype results.
+
+  python scripts/bench.py                      # run all cases, compare to baseline
+  python scripts/bench.py tasks render         # only cases whose name starts so
+  python scripts/bench.py --update-baseline    # record the current numbers
+
+Reported per case: wall time, requests, bytes served, peak RSS of the child
+and bytes of output it wrote. Only the machine-independent numbers are
+gated: compared with BENCH_BASELINE, a case fails when it made more
+requests or served or wrote >10% more bytes, and any failure exits 1.
+Wall time and RSS depend on the box the baseline was recorded on; they are
+shown as relative changes and a large jump is printed as a note, never a
+failure.
+
+  BENCH_BASELINE       baseline file     (default scripts/bench_baseline.json)
+  BENCH_REPEAT         runs per case, best wall time is kept          (1)
+  BENCH_MIN_SLOWDOWN   no note for wall-time growth below this, s     (0.25)
+"""
+
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+
+import standin_server
+
+HERE     = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.environ.get("BENCH_BASELINE", os.path.join(HERE, "bench_baseline.json"))
+REPEAT   = max(1, int(os.environ.get("BENCH_REPEAT", "") or 1))
+MIN_SLOWDOWN = float(os.environ.get("BENCH_MIN_SLOWDOWN", "") or 0.25)
+
+REPO     = "bench/dashboard"
+SQL_REPO = "bench/sql"
+LC_USER  = "bench-lc"
+MT_USER  = "bench-mt"
+
+
+# ── synthetic upstream ────────────────────────────────────────────────────────
+def _json(obj):
+    return 200, {"Content-Type": "application/json"}, json.dumps(obj).encode()
+
+
+class Synthetic:
+    """Answers every request the scripts make, from a seeded generator.
+
+    years     LeetCode active years (current one included)
+    results   Monkeytype results in the history
+    issues    GitHub issues labelled `task` (a third of them with comments)
+    team      roster members (see roster()); "ghost" users do not exist
+    """
+
+    def __init__(self, years=1, results=1000, issues=10, team=0, seed=7):
+        self.years, self.n_results, self.n_issues = years, results, issues
+        self.team  = team
+        self.seed  = seed
+        self.today = datetime.now(timezone.utc).date()
+        self._memo = {}
+
+    def memo(self, key, build):
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+    def __call__(self, method, host, path, body, headers):
+        url = urllib.parse.urlsplit(path)
+        q = dict(urllib.parse.parse_qsl(url.query))
+        if host == "api.monkeytype.com":
+            return self.monkeytype(url.path, q)
+        if host == "leetcode.com" and url.path == "/graphql":
+            return _json({"data": self.leetcode(json.loads(body or b"{}"))})
+        if host == "api.github.com":
+            return self.github(method, url.path, q, body)
+        return None
+
+    # Monkeytype
+    def results(self):
+        def build():
+            rng = random.Random(self.seed)
+            end = int(datetime.combine(self.today, datetime.min.time(),
+                                       tzinfo=timezone.utc).timestamp() * 1000)
+            span = 365 * self.years * 86400 * 1000
+            modes = [("time", "15"), ("time", "30"), ("time", "60"), ("words", "50")]
+            out = []
+            for i in range(self.n_results):
+                mode, mode2 = modes[i % len(modes)]
+                wpm = round(rng.gauss(85, 12), 2)
+                out.append({"_id": f"r{i}", "timestamp": end - span + i * span // self.n_results,
+                            "mode": mode, "mode2": mode2, "wpm": wpm,
+                            "rawWpm": round(wpm + rng.uniform(0, 6), 2),
+                            "acc": round(rng.uniform(90, 100), 2),
+                            "consistency": round(rng.uniform(60, 85), 2)})
+            out.reverse()                         # newest first, like the API
+            return out
+        return self.memo("results", build)
+
+    def roster(self):
+        return [{"name": f"Member {i}", "leetcode": f"lc{i}" if i % 7 else f"ghost{i}",
+                 "monkeytype": f"mt{i}" if i % 5 else None} for i in range(self.team)]
+
+    def monkeytype(self, path, q):
+        if path.endswith("/profile"):
+            best = lambda w: [{"wpm": w, "rawWpm": w + 4, "acc": 97.5, "consistency": 78.1}]
+            return _json({"data": {
+                "typingStats": {"completedTests": self.n_results, "startedTests": self.n_results + 40,
+                                "timeTyping": self.n_results * 31.5},
+                "personalBests": {"time": {"15": best(121.4), "30": best(112.0), "60": best(104.2)},
+                                  "words": {"50": best(109.9)}},
+                "streak": 12, "maxStreak": 48, "xp": self.n_results * 37}})
+        if path == "/results":
+            since  = int(q.get("onOrAfterTimestamp", 0))
+            offset, limit = int(q.get("offset", 0)), int(q.get("limit", 1000))
+            rows = [r for r in self.results() if r["timestamp"] >= since]
+            return _json({"data": rows[offset:offset + limit]})
+        if path == "/results/last":
+            return _json({"data": self.results()[0]})
+        return None
+
+    # LeetCode
+    def calendar(self, year):
+        def build():
+            rng = random.Random(self.seed * 10000 + year)
+            day, end, cal = datetime(year, 1, 1).date(), min(self.today, datetime(year, 12, 31).date()), {}
+            while day <= end:
+                if rng.random() < 0.6:
+                    ts = int(datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc).timestamp())
+                    cal[str(ts)] = rng.choice((1, 1, 2, 3, 4, 6, 9))
+                day += timedelta(days=1)
+            return cal
+        return self.memo(("cal", year), build)
+
+    def leetcode(self, req):
+        cur  = self.today.year
+        data = {}
+        for alias in re.findall(r"^\s*(\w+):", req.get("query", ""), re.M):
+            if re.fullmatch(r"m\d+", alias):          # a team member's matchedUser
+                user = (req.get("variables") or {}).get("u" + alias[1:], "")
+                k = sum(map(ord, user))
+                data[alias] = None if user.startswith("ghost") else {
+                    "profile": {"ranking": 10000 + k * 37},
+                    "submitStatsGlobal": {"acSubmissionNum": [
+                        {"difficulty": d, "count": c} for d, c in
+                        (("All", k % 400 + 30), ("Easy", k % 200), ("Medium", k % 150), ("Hard", k % 50))]},
+                    "userCalendar": {"streak": k % 30, "totalActiveDays": k % 300}}
+            elif alias == "stats":
+                data[alias] = {
+                    "username": LC_USER,
+                    "profile": {"ranking": 123456, "reputation": 42, "starRating": 3.5},
+                    "submitStatsGlobal": {"acSubmissionNum": [
+                        {"difficulty": d, "count": c, "submissions": c * 2}
+                        for d, c in (("All", 610), ("Easy", 250), ("Medium", 300), ("Hard", 60))]},
+                    "problemsSolvedBeatsStats": [
+                        {"difficulty": d, "percentage": p}
+                        for d, p in (("Easy", 91.2), ("Medium", 88.4), ("Hard", 70.1))],
+                    "submissionCalendar": json.dumps(self.calendar(cur)),
+                }
+            elif alias == "allQuestionsCount":
+                data[alias] = [{"difficulty": d, "count": c}
+                               for d, c in (("All", 3300), ("Easy", 830), ("Medium", 1730), ("Hard", 740))]
+            elif alias == "langs":
+                data[alias] = {"languageProblemCount": [
+                    {"languageName": n, "problemsSolved": 600 // (i + 1)}
+                    for i, n in enumerate(("Python3", "MySQL", "C++", "Java", "Go", "Rust", "Bash"))]}
+            elif alias == "tags":
+                tier = lambda names, k: [{"tagName": n, "problemsSolved": k * (i + 1)} for i, n in enumerate(names)]
+                data[alias] = {"tagProblemCounts": {
+                    "advanced":     tier(("Dynamic Programming", "Backtracking", "Trie"), 20),
+                    "intermediate": tier(("Hash Table", "Tree", "Greedy", "Binary Search"), 30),
+                    "fundamental":  tier(("Array", "String", "Sorting"), 60)}}
+            elif alias == "calendar":
+                cal = self.calendar(cur)
+                data[alias] = {"userCalendar": {
+                    "activeYears": list(range(cur - self.years + 1, cur + 1)),
+                    "streak": 9, "totalActiveDays": sum(len(self.calendar(y)) for y in
+                                                        range(cur - self.years + 1, cur + 1)),
+                    "submissionCalendar": json.dumps(cal)}}
+            elif re.fullmatch(r"y\d{4}", alias):
+                data[alias] = {"userCalendar": {"submissionCalendar": json.dumps(self.calendar(int(alias[1:])))}}
+        return data
+
+    # GitHub
+    def issues(self):
+        def build():
+            base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+            stamp = lambda minutes: (base + timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            return [{"number": n, "title": f"Task {n}: synthetic work item for the benchmark",
+                     "state": "closed" if n % 3 == 0 else "open",
+                     "html_url": f"https://github.com/{REPO}/issues/{n}",
+                     "created_at": stamp(n * 10), "updated_at": stamp(n * 10 + 5),
+                     "comments": 2 if n % 3 == 1 else 0, "labels": [{"name": "task"}],
+                     "comments_url": f"https://api.github.com/repos/{REPO}/issues/{n}/comments"}
+                    for n in range(self.n_issues, 0, -1)]
+        return self.memo("issues", build)
+
+    def comments(self):
+        def build():
+            base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+            out = []
+            for i in self.issues():
+                for k in range(i["comments"]):
+                    at = base + timedelta(minutes=i["number"] * 10 + 6 + k)
+                    out.append({"id": i["number"] * 10 + k,
+                                "body": f"Progress note {k + 1} on task {i['number']}.",
+                                "created_at": at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                                "updated_at": at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                                "issue_url": f"https://api.github.com/repos/{REPO}/issues/{i['number']}"})
+            out.sort(key=lambda c: c["created_at"], reverse=True)
+            return out
+        return self.memo("comments", build)
+
+    def github(self, method, path, q, body):
+        if method == "POST" and path == "/graphql":
+            query = json.loads(body or b"{}").get("query", "")
+            counts = {f"w{n}": {"totalCount": 2 + int(n) % 3} for n in re.findall(r"\bw(\d+):", query)}
+            return _json({"data": {"repository": {"defaultBranchRef": {"target": counts}}}})
+        if path == f"/repos/{SQL_REPO}/contents":
+            return _json([{"name": f"case-study-{n}", "type": "dir"} for n in range(1, 9)]
+                         + [{"name": "README.md", "type": "file"}])
+        page = lambda rows: rows[(int(q.get("page", 1)) - 1) * int(q.get("per_page", 30)):
+                                 int(q.get("page", 1)) * int(q.get("per_page", 30))]
+        if path == f"/repos/{REPO}/issues":
+            rows = self.issues()
+            if "since" in q:
+                rows = [i for i in rows if i["updated_at"] > q["since"]]
+            return _json(page(rows))
+        if path == f"/repos/{REPO}/issues/comments":
+            rows = self.comments()
+            if "since" in q:
+                rows = sorted((c for c in rows if c["updated_at"] > q["since"]),
+                              key=lambda c: c["updated_at"])
+            return _json(page(rows))
+        m = re.fullmatch(rf"/repos/{re.escape(REPO)}/issues/(\d+)/comments", path)
+        if m:
+            return _json(page(sorted((c for c in self.comments()
+                                      if c["issue_url"].endswith("/" + m.group(1))),
+                                     key=lambda c: c["created_at"])))
+        return None
+
+
+# ── cases ─────────────────────────────────────────────────────────────────────
+# name -> (generator sizes, setup runs, measured run, extra env)
+FETCH  = ("fetch_data.py",)
+TASKS  = ("build_dashboard.py",)
+RENDER = ("render_svg.py", "--force")
+CASES = {
+    "fetch-1y-1k":        ({"years": 1, "results": 1000},  [], FETCH, {}),
+    "fetch-5y-10k":       ({"years": 5, "results": 10000}, [], FETCH, {}),
+    # second run with snapshots off: history/calendar stores and 304s do the work
+    "fetch-5y-10k-warm":  ({"years": 5, "results": 10000}, [FETCH], FETCH, {"SNAPSHOT": "0"}),
+    "tasks-10":           ({"issues": 10},    [], TASKS, {}),
+    "tasks-500":          ({"issues": 500},   [], TASKS, {}),
+    "tasks-10k":          ({"issues": 10000}, [], TASKS, {}),
+    "tasks-10k-incr":     ({"issues": 10000}, [TASKS], TASKS, {}),
+    "render-1y":          ({"years": 1}, [FETCH, ("fetch_leetcode.py",)], RENDER, {}),
+    "render-5y":          ({"years": 5}, [FETCH, ("fetch_leetcode.py",)], RENDER, {}),
+    "team-50":            ({"team": 50}, [], FETCH, {"TEAM_ROSTER": "team.json"}),
+}
+
+METRICS = ("wall_s", "requests", "bytes", "rss_kb", "output_bytes")
+
+
+def case_env(base_url, state):
+    env = {k: v for k, v in os.environ.items()
+           if not k.startswith(("HTTP_", "LEETCODE_", "MONKEYTYPE_", "GITHUB_", "TASK_"))}
+    env.update({
+        "HTTP_BASE_OVERRIDE": base_url,
+        "HTTP_CACHE_DIR":     os.path.join(state, "http"),
+        "SNAPSHOT_DIR":       os.path.join(state, "snapshots"),
+        "RATE_STATE":         os.path.join(state, "ratelimit.json"),
+        "SVG_STATE":          os.path.join(state, "svg_cards.json"),
+        "FETCH_RETRIES":      "0",
+        "GITHUB_REPOSITORY":  REPO,
+        "GITHUB_TOKEN":       "bench-token",
+        "MONKEYTYPE_APE_KEY": "bench-key",
+        "MT_USERNAME":        MT_USER,
+        "LC_USERNAME":        LC_USER,
+        "LEETCODE_USERNAME":  LC_USER,
+        "SQL_REPO":           SQL_REPO,
+    })
+    return env
+
+
+def files(root):
+    """{path: (size, mtime_ns)} under root."""
+    out = {}
+    for d, _, names in os.walk(root):
+        for n in names:
+            st = os.stat(os.path.join(d, n))
+            out[os.path.join(d, n)] = (st.st_size, st.st_mtime_ns)
+    return out
+
+
+# Runs an entry point as __main__ and, on exit, writes the process's own peak
+# RSS to BENCH_RSS_FILE. (ru_maxrss from wait4 would include the benchmark
+# process itself, since a forked child inherits its parent's high-water mark.)
+CHILD = """
+import atexit, os, resource, runpy, sys
+def peak():
+    try:
+        with open("/proc/self/status") as f:
+            kb = next(int(l.split()[1]) for l in f if l.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        kb = kb // 1024 if sys.platform == "darwin" else kb
+    with open(os.environ["BENCH_RSS_FILE"], "w") as f:
+        f.write(str(kb))
+atexit.register(peak)
+sys.argv = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(sys.argv[0]))
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+def run(script_args, cwd, env, log):
+    """Run one entry point; returns (seconds, peak RSS in KB)."""
+    rss_file = log + ".rss"
+    with open(log, "ab") as out:
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", CHILD,
+                               os.path.join(HERE, script_args[0]), *script_args[1:]],
+                              cwd=cwd, env={**env, "BENCH_RSS_FILE": rss_file},
+                              stdout=out, stderr=subprocess.STDOUT)
+        secs = time.perf_counter() - t0
+    if proc.returncode:
+        with open(log, "rb") as f:
+            tail = f.read()[-2000:].decode("utf-8", "replace")
+        raise RuntimeError(f"{script_args[0]} exited {proc.returncode}:\n{tail}")
+    with open(rss_file, "r") as f:
+        return secs, int(f.read())
+
+
+def bench_case(name):
+    sizes, setup, measured, extra = CASES[name]
+    synthetic = Synthetic(**sizes)
+    server, url, stats = standin_server.serve(synthetic)
+    best = None
+    try:
+        for _ in range(REPEAT):
+            scratch = tempfile.mkdtemp(prefix=f"bench-{name}-")
+            try:
+                work, state = os.path.join(scratch, "work"), os.path.join(scratch, "state")
+                os.makedirs(work)
+                os.makedirs(state)
+                with open(os.path.join(work, "README.md"), "w", encoding="utf-8") as f:
+                    f.write("# bench\n")
+                with open(os.path.join(work, "team.json"), "w", encoding="utf-8") as f:
+                    json.dump(synthetic.roster(), f)
+                env, log = case_env(url, state), os.path.join(state, "log.txt")
+                for step in setup:
+                    run(step, work, env, log)
+                before = files(work)
+                with stats["lock"]:
+                    stats["requests"] = stats["bytes"] = 0
+                secs, rss = run(measured, work, {**env, **extra}, log)
+                after = files(work)
+                written = sum(size for p, (size, mtime) in after.items() if before.get(p) != (size, mtime))
+                got = {"wall_s": round(secs, 3), "requests": stats["requests"],
+                       "bytes": stats["bytes"], "rss_kb": rss, "output_bytes": written}
+            finally:
+                shutil.rmtree(scratch, ignore_errors=True)
+            if best is None or got["wall_s"] < best["wall_s"]:
+                best = got
+    finally:
+        server.shutdown()
+        server.server_close()
+    return best
+
+
+# ── baseline comparison ───────────────────────────────────────────────────────
+def regressions(got, base):
+    """Human-readable reasons got is worse than base (empty when it is not).
+
+    Only counts that do not depend on the machine: requests and bytes.
+    """
+    if not base:
+        return []
+    out = []
+    if got["requests"] > base["requests"]:
+        out.append(f"requests {base['requests']} -> {got['requests']}")
+    for metric in ("bytes", "output_bytes"):
+        if got[metric] > base[metric] * 1.10:
+            out.append(f"{metric} {base[metric]:,} -> {got[metric]:,}")
+    return out
+
+
+def notes(got, base):
+    """Wall-time and memory growth worth a look (informational only)."""
+    if not base:
+        return []
+    out = []
+    if got["wall_s"] > base["wall_s"] * 1.5 and got["wall_s"] - base["wall_s"] > MIN_SLOWDOWN:
+        out.append(f"wall {delta(got, base, 'wall_s')}")
+    if got["rss_kb"] > base["rss_kb"] * 1.25:
+        out.append(f"rss {delta(got, base, 'rss_kb')}")
+    return out
+
+
+def delta(got, base, metric):
+    if not base or not base.get(metric):
+        return ""
+    return f"{(got[metric] / base[metric] - 1) * 100:+.0f}%"
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    update = "--update-baseline" in argv
+    wanted = [a for a in argv if not a.startswith("--")]
+    names = [n for n in CASES if not wanted or n.startswith(tuple(wanted))]
+    try:
+        with open(BASELINE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+
+    print(f"{'case':<20} {'wall':>8} {'':>5} {'reqs':>6} {'bytes':>12} {'':>5} "
+          f"{'rss KB':>9} {'':>5} {'output':>11} {'':>5}")
+    results, failed, noted = {}, {}, {}
+    for name in names:
+        got = results[name] = bench_case(name)
+        base = baseline.get(name)
+        print(f"{name:<20} {got['wall_s']:>7.2f}s {delta(got, base, 'wall_s'):>5} "
+              f"{got['requests']:>6} {got['bytes']:>12,} {delta(got, base, 'bytes'):>5} "
+              f"{got['rss_kb']:>9,} {delta(got, base, 'rss_kb'):>5} "
+              f"{got['output_bytes']:>11,} {delta(got, base, 'output_bytes'):>5}", flush=True)
+        if not update and regressions(got, base):
+            failed[name] = regressions(got, base)
+        if not update and notes(got, base):
+            noted[name] = notes(got, base)
+
+    if update:
+        baseline.update(results)
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline updated: {BASELINE}")
+        return 0
+    for name, why in noted.items():
+        print(f"note {name}: {'; '.join(why)} vs. the baseline box (not gated)")
+    for name, why in failed.items():
+        print(f"REGRESSION {name}: {'; '.join(why)}", file=sys.stderr)
+    missing = [n for n in names if n not in baseline]
+    if missing:
+        print(f"(no baseline for {', '.join(missing)} — run with --update-baseline)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,43 +6,66 @@ Each issue labeled `task` becomes a row:
   - open issue   -> pending / in progress
   - closed issue -> done
   - issue comments -> the latest one is shown as the "comment"
+                      (read in bulk from the repo-wide comment stream)
 
 The dashboard is written between these markers in your README:
   <!-- TASKS:START -->   ...generated content...   <!-- TASKS:END -->
+
+Issues and their latest comments are kept in a local store (TASK_STORE_PATH,
+committed next to the README). A normal run only asks GitHub for what changed
+since the last sync; run with --full (or TASK_FULL_SYNC=1) to rebuild it.
 """
 
 import json
 import os
-import re
 import sys
-import urllib.request
 import urllib.parse
 from datetime import datetime, timezone
 
-REPO        = os.environ["GITHUB_REPOSITORY"]          # "owner/repo"
-TOKEN       = os.environ["GITHUB_TOKEN"]
+import http_client
+import profiling
+import readme_sections
+
+# read with .get() so pipeline.py can import this module (and --plan) without
+# them; sync() insists on both
+REPO        = os.environ.get("GITHUB_REPOSITORY", "")  # "owner/repo"
+TOKEN       = os.environ.get("GITHUB_TOKEN", "")
 LABEL       = os.environ.get("TASK_LABEL", "task")
 README_PATH = os.environ.get("README_PATH", "README.md")
+STORE_PATH  = os.environ.get("TASK_STORE_PATH", "data/tasks.json")
 API         = "https://api.github.com"
-START, END  = "<!-- TASKS:START -->", "<!-- TASKS:END -->"
+DIRECT_FETCH_MAX = 10      # issues left when the comment-stream walk gives up
+
+
+def gh_headers():
+    return {
+        "Authorization": f"Bearer {TOKEN}",
+        "Accept": "application/vnd.github+json",
+        "User-Agent": "task-dashboard",
+    }
 
 
-def gh_get(url):
-    req = urllib.request.Request(url)
-    req.add_header("Authorization", f"Bearer {TOKEN}")
-    req.add_header("Accept", "application/vnd.github+json")
-    req.add_header("User-Agent", "task-dashboard")
-    with urllib.request.urlopen(req) as resp:
-        return json.loads(resp.read().decode())
+def gh_get(url, label):
+    # Conditional request: a 304 replays the cached body and is free against
+    # the rate limit, so re-running on every issue event stays cheap.
+    return http_client.http_get(url, gh_headers(), timeout=30, label=label)
 
 
-def get_issues():
-    """All issues (open + closed) carrying the task label, excluding pull requests."""
+def get_issues(since=None):
+    """Issues (open + closed), excluding pull requests.
+
+    Without `since`: every issue carrying the task label. With `since`: every
+    issue updated after that time, labeled or not, so the caller can also see
+    tasks that lost the label.
+    """
     issues, page = [], 1
-    label = urllib.parse.quote(LABEL)
+    if since:
+        query = f"since={urllib.parse.quote(since)}"
+    else:
+        query = f"labels={urllib.parse.quote(LABEL)}"
     while True:
-        url = f"{API}/repos/{REPO}/issues?state=all&labels={label}&per_page=100&page={page}"
-        batch = gh_get(url)
+        url = f"{API}/repos/{REPO}/issues?state=all&{query}&per_page=100&page={page}"
+        batch = gh_get(url, "gh.issues")
         if not batch:
             break
         issues += [i for i in batch if "pull_request" not in i]
@@ -52,11 +75,201 @@ def get_issues():
     return issues
 
 
-def latest_comment(issue):
-    if issue.get("comments", 0) == 0:
-        return ""
-    comments = gh_get(issue["comments_url"])
-    return comments[-1]["body"] if comments else ""
+def issue_number(comment):
+    return int(comment["issue_url"].rsplit("/", 1)[1])
+
+
+def slim_comment(c):
+    return {"id": c["id"], "body": c["body"], "created_at": c["created_at"]}
+
+
+def latest_comments(issues):
+    """{issue number: latest comment} for every issue that has comments.
+
+    Walks the repo-wide comment stream newest-first instead of asking each
+    issue for its comments, so the cost is a page per 100 recent comments
+    rather than a request per task. Stops as soon as every issue is covered,
+    or once only a few old issues are left: an issue last updated before the
+    oldest comment on the current page has its comments further down, and
+    fetching those few directly beats paging through everything in between.
+    """
+    wanted = {i["number"]: i for i in issues if i.get("comments", 0)}
+    found, page = {}, 1
+    while wanted.keys() - found.keys():
+        url = (f"{API}/repos/{REPO}/issues/comments"
+               f"?sort=created&direction=desc&per_page=100&page={page}")
+        batch = gh_get(url, "gh.comments")
+        for c in batch:
+            n = issue_number(c)
+            if n in wanted and n not in found:
+                found[n] = slim_comment(c)
+        if len(batch) < 100:
+            break
+        left = [wanted[n] for n in wanted.keys() - found.keys()]
+        oldest = batch[-1]["created_at"]
+        if len(left) <= DIRECT_FETCH_MAX and all(i["updated_at"] < oldest for i in left):
+            for i in left:
+                c = last_comment(i)
+                if c:
+                    found[i["number"]] = c
+            break
+        page += 1
+    return found
+
+
+def last_comment(issue):
+    """The newest comment on one issue, or None.
+
+    An issue's comments come oldest-first, so with one comment per page the
+    page numbered by the comment count is the last one, however many there are.
+    """
+    n = issue.get("comments", 0)
+    if not n:
+        return None
+    cl = gh_get(f"{issue['comments_url']}?per_page=1&page={n}", "gh.issue.comments")
+    return slim_comment(cl[-1]) if cl else None
+
+
+def comments_since(since):
+    """Every comment created or edited after `since`, across the repo."""
+    comments, page = [], 1
+    while True:
+        url = (f"{API}/repos/{REPO}/issues/comments?since={urllib.parse.quote(since)}"
+               f"&sort=updated&direction=asc&per_page=100&page={page}")
+        batch = gh_get(url, "gh.comments.since")
+        comments += batch
+        if len(batch) < 100:
+            break
+        page += 1
+    return comments
+
+
+# ── local issue store ─────────────────────────────────────────────────────────
+ISSUE_FIELDS = ("number", "title", "state", "html_url",
+                "created_at", "updated_at", "comments")
+
+
+def is_task(issue):
+    return any(l.get("name") == LABEL for l in issue.get("labels", []))
+
+
+def load_store():
+    try:
+        with open(STORE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def store_text(store):
+    return json.dumps(store, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+
+
+def save_store(store, previous_sync=None):
+    """Write the store; returns False and leaves the file alone when nothing
+    but syncedAt would change.
+
+    Keeping the older syncedAt then is harmless: the next incremental sync
+    asks for a slightly wider window and merging what it gets back again is
+    idempotent.
+    """
+    if previous_sync:
+        try:
+            with open(STORE_PATH, "r", encoding="utf-8") as f:
+                if f.read() == store_text({**store, "syncedAt": previous_sync}):
+                    return False
+        except OSError:
+            pass
+    os.makedirs(os.path.dirname(STORE_PATH) or ".", exist_ok=True)
+    tmp = STORE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(store_text(store))
+    os.replace(tmp, STORE_PATH)
+    return True
+
+
+def full_sync():
+    issues = get_issues()
+    latest = latest_comments(issues)
+    return {
+        "issues": {str(i["number"]): {k: i[k] for k in ISSUE_FIELDS} for i in issues},
+        "latest": {str(n): c for n, c in latest.items()},
+    }
+
+
+def incremental_sync(store, since):
+    """Merge everything that changed since the last sync into the store."""
+    issues, latest = store["issues"], store["latest"]
+    for i in get_issues(since):
+        key = str(i["number"])
+        if not is_task(i):                       # label removed (or never a task)
+            issues.pop(key, None)
+            latest.pop(key, None)
+            continue
+        before = issues.get(key, {}).get("comments", 0)
+        issues[key] = {k: i[k] for k in ISSUE_FIELDS}
+        if i["comments"] < before or (i["comments"] and key not in latest):
+            # latest comment deleted, or a task we have never seen comments for:
+            # re-read just this issue's newest comment
+            c = last_comment(i)
+            if c:
+                latest[key] = c
+            else:
+                latest.pop(key, None)
+    for c in comments_since(since):
+        key = str(issue_number(c))
+        cur = latest.get(key)
+        if key in issues and (not cur or c["id"] == cur["id"]
+                              or c["created_at"] >= cur["created_at"]):
+            latest[key] = slim_comment(c)
+
+
+def sync(full=False):
+    """Bring the local store up to date and return it."""
+    if not REPO or not TOKEN:
+        raise RuntimeError("GITHUB_REPOSITORY and GITHUB_TOKEN must be set")
+    started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    with profiling.phase("parse"):
+        store = load_store()
+    previous = None if full else store.get("syncedAt")
+    if full or not store.get("syncedAt"):
+        print("Full task sync.")
+        store = full_sync()
+    else:
+        print(f"Incremental task sync since {store['syncedAt']}.")
+        incremental_sync(store, store["syncedAt"])
+    store["syncedAt"] = started
+    with profiling.phase("write"):
+        if not save_store(store, previous):
+            print("Task store unchanged.")
+    return store
+
+
+def plan_calls(full=False):
+    """Expected requests for the next sync, as ratelimit.report() rows.
+
+    The upper bound comes from the store: every issue page, the comment
+    stream for every stored comment, and a per-issue read for each task that
+    has comments (incremental) or DIRECT_FETCH_MAX of them (full). Without a
+    store the size of the repository is unknown and the row is unbounded.
+    """
+    if not REPO:
+        return [("tasks", "api.github.com/core", None, 0, 0, "skipped: GITHUB_REPOSITORY unset")]
+    store = load_store()
+    issues = list(store.get("issues", {}).values())
+    if not issues and not store.get("syncedAt"):
+        return [("tasks", "api.github.com/core", gh_headers(), 2, None,
+                 "first full sync: repository size unknown")]
+    issue_pages  = len(issues) // 100 + 1
+    stream_pages = sum(i.get("comments", 0) for i in issues) // 100 + 1
+    commented    = sum(1 for i in issues if i.get("comments", 0))
+    if full or not store.get("syncedAt"):
+        return [("tasks", "api.github.com/core", gh_headers(), issue_pages + 1,
+                 issue_pages + stream_pages + min(commented, DIRECT_FETCH_MAX),
+                 f"full sync: {len(issues)} task(s), comment stream + direct reads")]
+    return [("tasks", "api.github.com/core", gh_headers(), 2,
+             issue_pages + stream_pages + commented,
+             f"changes since {store['syncedAt']} (worst case: every task changed)")]
 
 
 def clean(text, n=90):
@@ -69,7 +282,7 @@ def fmt_date(iso):
     return datetime.fromisoformat(iso.replace("Z", "+00:00")).strftime("%Y-%m-%d")
 
 
-def build_section(issues):
+def build_section(issues, comments):
     total = len(issues)
     done = sum(1 for i in issues if i["state"] == "closed")
     pending = total - done
@@ -96,41 +309,33 @@ def build_section(issues):
         status = "✅" if i["state"] == "closed" else "⏳"
         title = f"[{clean(i['title'], 60)}]({i['html_url']})"
         added = fmt_date(i["created_at"])
-        comment = clean(latest_comment(i)) or "—"
+        comment = clean((comments.get(str(i["number"])) or {}).get("body", "")) or "—"
         rows.append(f"| {status} | {title} | {added} | {comment} |")
 
     stamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     return (
-        f"{START}\n"
         f"## 🗂️ Daily Task Dashboard\n\n"
         f"{badges}\n\n"
         + "\n".join(rows) +
         f"\n\n<sub>⏳ pending · ✅ done — add a task by opening an issue labeled "
-        f"`{LABEL}`, comment on it to add notes. Last updated {stamp}.</sub>\n"
-        f"{END}"
+        f"`{LABEL}`, comment on it to add notes. Last updated {stamp}.</sub>"
     )
 
 
-def main():
-    issues = get_issues()
-    section = build_section(issues)
-
-    with open(README_PATH, "r", encoding="utf-8") as f:
-        readme = f.read()
+def tasks_section(store):
+    """TASKS section body for a synced store."""
+    return build_section(list(store["issues"].values()), store["latest"])
 
-    if START in readme and END in readme:
-        readme = re.sub(
-            re.escape(START) + r".*?" + re.escape(END),
-            section, readme, flags=re.DOTALL,
-        )
-    else:
-        readme = readme.rstrip() + "\n\n" + section + "\n"
-
-    with open(README_PATH, "w", encoding="utf-8") as f:
-        f.write(readme)
 
-    print(f"Dashboard updated: {len(issues)} task(s).")
+def main():
+    full = "--full" in sys.argv[1:] or os.environ.get("TASK_FULL_SYNC") == "1"
+    store = sync(full)
+    with profiling.phase("render"):
+        section = tasks_section(store)
+    with profiling.phase("write"):
+        readme_sections.update(README_PATH, {"TASKS": section}, append_missing={"TASKS"})
+    print(f"Dashboard updated: {len(store['issues'])} task(s).")
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(profiling.run(main))
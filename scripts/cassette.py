@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+cassette.py — record real API responses so refreshes can be replayed offline.
+
+  HTTP_RECORD=cassettes/live.json python scripts/pipeline.py --force
+
+records every request http_client makes (GETs and POSTs; LeetCode GraphQL,
+Monkeytype, GitHub) into the cassette file when the process exits. Replay it
+with the stand-in server:
+
+  python scripts/standin_server.py cassettes/live.json --port 8765 &
+  HTTP_BASE_OVERRIDE=http://127.0.0.1:8765 python scripts/pipeline.py --force
+
+While recording, the conditional-request cache is bypassed so every response
+is captured with its body. Only the response is stored — never request
+headers — so tokens and cookies do not end up in the file.
+
+Interactions are keyed by method, host, path+query and a hash of the request
+body (GraphQL POSTs differ only there). Repeated identical requests keep
+every response and replay them in order. Query parameters that carry the
+caller's last sync time (VOLATILE_PARAMS: GitHub's `since`, Monkeytype's
+`onOrAfterTimestamp`) are left out of the key, so an incremental run still
+finds its recording; it gets back what was recorded, whatever time it asks
+for.
+"""
+
+import atexit
+import base64
+import hashlib
+import json
+import os
+import threading
+import urllib.parse
+
+RECORD_PATH = os.environ.get("HTTP_RECORD", "")
+RECORDING   = bool(RECORD_PATH)
+
+# response headers worth replaying (the rest are hop-by-hop or server noise)
+KEEP_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After",
+                "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset",
+                "X-RateLimit-Resource")
+# query parameters that change from run to run without changing the endpoint
+VOLATILE_PARAMS = {"since", "onOrAfterTimestamp"}
+
+
+def body_hash(body):
+    if not body:
+        return ""
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+def stable_path(path):
+    """path+query without the VOLATILE_PARAMS."""
+    base, _, query = path.partition("?")
+    if not query:
+        return path
+    kept = [(k, v) for k, v in urllib.parse.parse_qsl(query, keep_blank_values=True)
+            if k not in VOLATILE_PARAMS]
+    return base + ("?" + urllib.parse.urlencode(kept) if kept else "")
+
+
+def key(method, host, path, body=None):
+    return f"{method.upper()} {host}{stable_path(path)} {body_hash(body)}".rstrip()
+
+
+class Cassette:
+    def __init__(self, interactions=None):
+        self.interactions = interactions or {}     # key -> [response, ...]
+        self._fresh  = set()                        # keys re-recorded this run
+        self._cursor = {}                           # key -> next index on replay
+        self._lock   = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f).get("interactions"))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with self._lock, open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "interactions": self.interactions}, f,
+                      indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+    def add(self, method, url, req_body, status, headers, body):
+        parts = urllib.parse.urlsplit(url)
+        path  = parts.path + ("?" + parts.query if parts.query else "")
+        k = key(method, parts.netloc, path, req_body)
+        try:
+            entry = {"status": status, "body": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            entry = {"status": status, "body64": base64.b64encode(body).decode()}
+        entry["headers"] = {h: headers[h] for h in KEEP_HEADERS if headers.get(h)}
+        with self._lock:
+            if k not in self._fresh:                # replace what an older recording had
+                self._fresh.add(k)
+                self.interactions[k] = []
+            self.interactions[k].append(entry)
+
+    def next(self, method, host, path, body=None):
+        """(status, headers, body bytes) for a request, or None if never recorded.
+
+        Several responses for one key are played back in order; the last one
+        repeats once they run out.
+        """
+        k = key(method, host, path, body)
+        with self._lock:
+            entries = self.interactions.get(k)
+            if not entries:
+                return None
+            i = self._cursor.get(k, 0)
+            self._cursor[k] = i + 1
+            e = entries[min(i, len(entries) - 1)]
+        raw = base64.b64decode(e["body64"]) if "body64" in e else e["body"].encode()
+        return e["status"], dict(e.get("headers") or {}), raw
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def record(method, url, req_body, resp):
+    """Add one http_client Response to the HTTP_RECORD cassette."""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = Cassette.load(RECORD_PATH)
+            atexit.register(lambda: _recorder.save(RECORD_PATH))
+    _recorder.add(method, url, req_body, resp.status, resp.headers, resp.body)
@@ -2,27 +2,74 @@
 """
 fetch_data.py  — fetches all dashboard data and writes data.json
 Monkeytype : public profile endpoint  (no ApeKey needed for profile)
-             ApeKey used for recent results + streak
+             ApeKey used for results, kept as an incremental local history
 LeetCode   : GraphQL — solved counts, language stats, skill tags, calendar
-SQL        : GitHub API commit counts per folder
+             (one aliased query document per run)
+SQL        : GitHub commit counts per folder (GraphQL history, REST fallback)
+Team       : with TEAM_ROSTER, LeetCode + Monkeytype for every roster member
+             and precomputed leaderboards (LeetCode in aliased batches)
+
+The three sources (and the independent requests inside each) are fetched
+concurrently; FETCH_CONCURRENCY caps requests in flight (1 = sequential).
+A source that fails is retried (FETCH_RETRIES) and otherwise keeps its last
+good section from the previous data.json, marked "stale".
+
+data.json is also split into content-hashed shards for index.html (shards.py).
+
+  python scripts/fetch_data.py --plan   # expected HTTP calls, no requests made
 """
 
-import json, os, sys, urllib.request, urllib.error, urllib.parse, traceback
+import json, os, re, sys, urllib.parse, traceback
+import threading, time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, date
 from collections import defaultdict
 
+import http_client
+import mt_history
+import profiling
+import ratelimit
+import shards
+import snapshots
+from activity import DailySeries
+
+# Max HTTP requests in flight across all sources. 1 = the old sequential run.
+CONCURRENCY = max(1, int(os.environ.get("FETCH_CONCURRENCY", "") or 4))
+_http_slots = threading.BoundedSemaphore(CONCURRENCY)
+
 # ── HTTP helpers ──────────────────────────────────────────────────────────────
-def http_get(url, headers=None):
-    req = urllib.request.Request(url, headers=headers or {})
-    with urllib.request.urlopen(req, timeout=20) as r:
-        return json.loads(r.read().decode())
-
-def http_post_json(url, body, headers=None):
-    data = json.dumps(body).encode()
-    h = {"Content-Type": "application/json", **(headers or {})}
-    req = urllib.request.Request(url, data=data, headers=h)
-    with urllib.request.urlopen(req, timeout=20) as r:
-        return json.loads(r.read().decode())
+# Both go through the shared keep-alive client; GETs are conditional, so
+# unchanged responses come back as 304 and replay from the disk cache.
+def http_get(url, headers=None, label=None):
+    with _http_slots:
+        return http_client.http_get(url, headers, timeout=20, label=label)
+
+def http_post_json(url, body, headers=None, label=None):
+    with _http_slots:
+        return http_client.http_post_json(url, body, headers, timeout=20, label=label)
+
+def fan_out(jobs, workers=None):
+    """Run {label: fn} side by side and return {label: result}.
+
+    Threads only wait on the network; the number of requests actually in
+    flight is capped by FETCH_CONCURRENCY through the HTTP helpers above.
+    `workers` caps the threads too (default: one per job).
+    """
+    if CONCURRENCY == 1 or len(jobs) < 2:
+        return {label: fn() for label, fn in jobs.items()}
+    with ThreadPoolExecutor(max_workers=min(len(jobs), workers or len(jobs))) as ex:
+        futures = {label: ex.submit(fn) for label, fn in jobs.items()}
+        return {label: f.result() for label, f in futures.items()}
+
+TIMINGS = {}
+
+def timed(label, fn):
+    """Run fn() and record its wall time (seconds) in TIMINGS[label]."""
+    t0 = time.perf_counter()
+    try:
+        return fn()
+    finally:
+        TIMINGS[label] = round(time.perf_counter() - t0, 2)
 
 def utcnow():
     return datetime.now(timezone.utc).isoformat()
@@ -39,31 +86,67 @@ def safe(fn, label):
 # ═══════════════════════════════════════════════════════════════════════════════
 #  MONKEYTYPE
 # ═══════════════════════════════════════════════════════════════════════════════
-def fetch_monkeytype(username: str, ape_key: str = "") -> dict:
+MT_PAGE = 1000          # Monkeytype's max `limit` for /results
+
+def sync_mt_history(base, auth):
+    """Load the stored result history and append only results newer than it."""
+    with profiling.phase("parse"):
+        hist = mt_history.History.load()
+    since = hist.latest_ts()
+    fresh, offset = [], 0
+    while True:
+        q = f"limit={MT_PAGE}&offset={offset}"
+        if since:
+            q += f"&onOrAfterTimestamp={since + 1}"
+        page = (http_get(f"{base}/results?{q}", headers=auth, label="mt.results") or {}).get("data") or []
+        fresh += page
+        if len(page) < MT_PAGE:
+            break
+        offset += MT_PAGE
+    with profiling.phase("aggregate"):
+        added = hist.add(fresh)
+    if added or not os.path.exists(mt_history.HISTORY_PATH):   # an empty store too
+        with profiling.phase("write"):
+            hist.save()
+    print(f"[MT] history: +{added} results, {len(hist)} stored", flush=True)
+    return hist
+
+def mt_sources(username: str, ape_key: str = ""):
+    """Public profile and, with an ApeKey, the synced result history:
+    ({"profile": ..., "lastResult": ...}, History or None)."""
     base  = "https://api.monkeytype.com"
     auth  = {"Authorization": f"ApeKey {ape_key}"} if ape_key else {}
 
-    # ── 1. Public profile (no ApeKey needed) ──────────────────────────────────
-    profile = safe(
-        lambda: http_get(f"{base}/users/{username}/profile?isUid=false"),
-        "MT-profile"
-    )
+    # public profile (no ApeKey needed) + new results, in parallel; without the
+    # profile there is nothing to publish, so its errors go to the caller
+    jobs = {"profile": lambda: http_get(f"{base}/users/{username}/profile?isUid=false",
+                                        label="mt.profile")}
+    if ape_key:
+        jobs["history"] = lambda: safe(lambda: sync_mt_history(base, auth), "MT-results")
+    got     = fan_out(jobs)
+    profile = got["profile"]
     pdata = {}
     if profile:
         raw = profile.get("data", profile)
         if isinstance(raw, dict):
             pdata = raw
             print(f"[MT] profile keys: {list(pdata.keys())}", flush=True)
+    hist = got.get("history")
+    last = hist.records(last=1) if hist is not None else []
+    return {"profile": pdata, "lastResult": last[0] if last else None}, hist
 
-    typing_stats = pdata.get("typingStats", {})
-    completed    = typing_stats.get("completedTests", 0)
-    time_typing  = typing_stats.get("timeTyping", 0)   # seconds
-    streak       = pdata.get("streak", 0)
-    max_streak   = pdata.get("maxStreak", 0)
-    xp           = pdata.get("xp", 0)
+def monkeytype_snapshot(username: str, ape_key: str = "") -> dict:
+    """{"profile": ..., "lastResult": ...} — shared with update_monkeytype_readme.
 
-    # ── 2. Personal bests from profile ────────────────────────────────────────
-    pb_raw = pdata.get("personalBests", {})
+    Reused from the snapshot store while fresh; otherwise fetched (and the
+    local result history synced) by mt_sources().
+    """
+    return snapshots.cached("monkeytype", username,
+                            lambda: mt_sources(username, ape_key)[0],
+                            ok=lambda d: d["profile"])
+
+def parse_personal_bests(pb_raw):
+    """{"time 60": {wpm, raw, acc, con}, ...} — the best entry of every mode."""
     # Shape: {"time": {"15": [{"wpm":..,"acc":..,"consistency":..}], "60": [...]},
     #         "words": {"50": [...], "100": [...]}}
     personal_bests = {}
@@ -82,41 +165,57 @@ def fetch_monkeytype(username: str, ape_key: str = "") -> dict:
                 "acc": round(float(best.get("acc", 0)), 1),
                 "con": round(float(best.get("consistency", 0)), 1),
             }
+    return personal_bests
+
+def fetch_monkeytype(username: str, ape_key: str = "") -> dict:
+    # ── 1. Public profile + result history (always fresh; stored for the README)
+    synced = {}
+
+    def fetch():
+        snap, synced["hist"] = mt_sources(username, ape_key)
+        return snap
+
+    pdata = snapshots.cached("monkeytype", username, fetch, ok=lambda d: d["profile"],
+                             refresh=True)["profile"]
+
+    typing_stats = pdata.get("typingStats", {})
+    completed    = typing_stats.get("completedTests", 0)
+    time_typing  = typing_stats.get("timeTyping", 0)   # seconds
+    streak       = pdata.get("streak", 0)
+    max_streak   = pdata.get("maxStreak", 0)
+    xp           = pdata.get("xp", 0)
+
+    # ── 2. Personal bests from profile ────────────────────────────────────────
+    personal_bests = parse_personal_bests(pdata.get("personalBests", {}))
     print(f"[MT] personal bests modes: {list(personal_bests.keys())}", flush=True)
 
-    # ── 3. Recent results (ApeKey required) ───────────────────────────────────
-    recent_modes = []
-    if ape_key:
-        results = safe(
-            lambda: http_get(f"{base}/results?limit=100", headers=auth),
-            "MT-results"
-        )
-        if results:
-            raw_list = results.get("data", [])
-            if isinstance(raw_list, list) and raw_list:
-                now_utc = datetime.now(timezone.utc)
-                day_start_ms = int(datetime(
-                    now_utc.year, now_utc.month, now_utc.day,
-                    tzinfo=timezone.utc).timestamp() * 1000)
-                today_r = [r for r in raw_list
-                           if isinstance(r.get("timestamp"), (int,float))
-                           and r["timestamp"] >= day_start_ms]
-                source  = today_r if today_r else raw_list
-                groups  = defaultdict(list)
-                for r in source:
-                    m  = str(r.get("mode","")).strip()
-                    m2 = str(r.get("mode2","")).strip()
-                    groups[f"{m} {m2}".strip() if m2 else m].append(r)
-                for lbl in sorted(groups):
-                    best = max(groups[lbl], key=lambda x: x.get("wpm", 0))
-                    recent_modes.append({
-                        "name": lbl,
-                        "wpm":  round(float(best.get("wpm", 0)), 1),
-                        "raw":  round(float(best.get("rawWpm", best.get("wpm", 0))), 1),
-                        "acc":  round(float(best.get("acc", 0)), 1),
-                        "con":  round(float(best.get("consistency", 0)), 1),
-                    })
-                print(f"[MT] recent modes: {[m['name'] for m in recent_modes]}", flush=True)
+    # ── 3. Recent results + history aggregates (ApeKey required) ──────────────
+    recent_modes, history = [], {}
+    hist = synced.get("hist")
+    if hist is None and ape_key:            # sync failed: what is stored still counts
+        with profiling.phase("parse"):
+            hist = mt_history.History.load()
+    if hist is not None and len(hist):
+        with profiling.phase("aggregate"):
+            now_utc = datetime.now(timezone.utc)
+            day_start_ms = int(datetime(
+                now_utc.year, now_utc.month, now_utc.day,
+                tzinfo=timezone.utc).timestamp() * 1000)
+            source  = hist.records(since_ts=day_start_ms) or hist.records(last=100)
+            groups  = defaultdict(list)
+            for r in source:
+                groups[r["name"]].append(r)
+            for lbl in sorted(groups):
+                best = max(groups[lbl], key=lambda x: x["wpm"])
+                recent_modes.append({
+                    "name": lbl,
+                    "wpm":  round(float(best["wpm"]), 1),
+                    "raw":  round(float(best["rawWpm"]), 1),
+                    "acc":  round(float(best["acc"]), 1),
+                    "con":  round(float(best["consistency"]), 1),
+                })
+            print(f"[MT] recent modes: {[m['name'] for m in recent_modes]}", flush=True)
+            history = hist.aggregates()
 
     hours_typed = round(time_typing / 3600, 1)
 
@@ -130,6 +229,7 @@ def fetch_monkeytype(username: str, ape_key: str = "") -> dict:
         "xp":            xp,
         "personalBests": personal_bests,
         "recentModes":   recent_modes,
+        "history":       history,
         "lastUpdated":   utcnow(),
     }
 
@@ -143,30 +243,174 @@ LC_HDR = {
     "Origin":       "https://leetcode.com",
     "User-Agent":   "Mozilla/5.0 (compatible; dashboard-bot/2.0)",
 }
+# optional logged-in session (set by the LeetCode SVG workflow)
+if os.environ.get("LEETCODE_SESSION") and os.environ.get("LEETCODE_CSRF"):
+    LC_HDR["Cookie"] = (f"LEETCODE_SESSION={os.environ['LEETCODE_SESSION']}; "
+                        f"csrftoken={os.environ['LEETCODE_CSRF']}")
+    LC_HDR["x-csrftoken"] = os.environ["LEETCODE_CSRF"]
 
-def lc_query(query, variables):
-    resp = http_post_json(LC_GQL, {"query": query, "variables": variables}, headers=LC_HDR)
-    errs = resp.get("errors")
-    if errs:
-        print(f"[LC] GraphQL errors: {errs}", file=sys.stderr)
-    return (resp.get("data") or {})
+def lc_query(query, variables, label="lc.graphql"):
+    """POST one GraphQL document; returns (data, errors) without raising on errors."""
+    resp = http_post_json(LC_GQL, {"query": query, "variables": variables},
+                          headers=LC_HDR, label=label)
+    return (resp.get("data") or {}), (resp.get("errors") or [])
 
-def fetch_leetcode(username: str) -> dict:
-    # ── query 1: solved counts + beats + ranking ──────────────────────────────
-    q1 = """
-    query q1($u:String!){
-      matchedUser(username:$u){
-        profile { ranking reputation }
+# Everything the dashboard needs about one user, as {alias: selection}.
+# gql_document() stitches these into a single aliased query.
+LC_VARS = "$u:String!,$year:Int"
+LC_FIELDS = {
+    # solved counts + beats + ranking (+ what fetch_leetcode.py needs, so the
+    # two scripts can share one snapshot)
+    "stats": """matchedUser(username:$u){
+        username
+        profile { ranking reputation starRating }
         submitStatsGlobal {
-          acSubmissionNum { difficulty count }
+          acSubmissionNum { difficulty count submissions }
         }
         problemsSolvedBeatsStats { difficulty percentage }
-      }
-      allQuestionsCount { difficulty count }
-    }"""
-    d1 = safe(lambda: lc_query(q1, {"u": username}), "LC-q1") or {}
-    user       = d1.get("matchedUser") or {}
-    all_q      = {x["difficulty"]: x["count"] for x in (d1.get("allQuestionsCount") or [])}
+        submissionCalendar
+      }""",
+    "allQuestionsCount": "allQuestionsCount { difficulty count }",
+    # language stats
+    "langs": """matchedUser(username:$u){
+        languageProblemCount { languageName problemsSolved }
+      }""",
+    # skill tags
+    "tags": """matchedUser(username:$u){
+        tagProblemCounts {
+          advanced     { tagName problemsSolved }
+          intermediate { tagName problemsSolved }
+          fundamental  { tagName problemsSolved }
+        }
+      }""",
+    # submission calendar (activity heatmap)
+    "calendar": """matchedUser(username:$u){
+        userCalendar(year:$year){
+          activeYears
+          streak
+          totalActiveDays
+          submissionCalendar
+        }
+      }""",
+}
+
+def gql_document(name, var_defs, fields):
+    """Compose one query document from {alias: selection} parts.
+
+    Only variables some selection actually references are declared, since
+    GraphQL rejects documents with unused variables.
+    """
+    body = "\n".join(f"  {alias}: {sel}" for alias, sel in fields.items())
+    used = [d for d in var_defs.split(",")
+            if d.strip() and re.search(re.escape(d.split(":")[0].strip()) + r"\b", body)]
+    head = f"query {name}({','.join(used)})" if used else f"query {name}"
+    return f"{head}{{\n{body}\n}}"
+
+def lc_batch(fields, variables, var_defs=LC_VARS, name="dashboard"):
+    """Fetch several aliased fields in one request; returns {alias: value}.
+
+    Partial results are kept: a field whose resolver errored comes back as
+    None while its siblings are still used. If LeetCode rejects the document
+    as a whole (no data at all, e.g. a field was removed from their schema),
+    each field is retried on its own so one bad selection cannot blank the
+    rest.
+    """
+    data, errs = lc_query(gql_document(name, var_defs, fields), variables, f"lc.{name}")
+    if errs:
+        print(f"[LC] GraphQL errors: {errs}", file=sys.stderr)
+    if not data and errs and len(fields) > 1:
+        print("[LC] batch rejected — retrying fields one by one", file=sys.stderr)
+        alone = fan_out({
+            alias: (lambda a=alias, sel=sel: safe(
+                lambda: lc_batch({a: sel}, variables, var_defs, f"{name}_{a}"),
+                f"LC-{a}") or {})
+            for alias, sel in fields.items()
+        })
+        return {alias: part.get(alias) for alias, part in alone.items()}
+    failed = sorted({str(e["path"][0]) for e in errs if e.get("path")})
+    if failed:
+        print(f"[LC] partial result — failed fields: {failed}", file=sys.stderr)
+    return {alias: data.get(alias) for alias in fields}
+
+# ── submission calendar store ─────────────────────────────────────────────────
+# Past years can never change, so each one is fetched once and kept for good;
+# only the current year (already part of LC_FIELDS) is refreshed every run.
+LC_CALENDAR_PATH = os.environ.get("LC_CALENDAR_PATH", "data/lc_calendar.json")
+
+def load_calendar_store(username):
+    try:
+        with open(LC_CALENDAR_PATH, "r", encoding="utf-8") as f:
+            store = json.load(f)
+    except (OSError, ValueError):
+        store = {}
+    if store.get("username") != username:
+        store = {"username": username, "years": {}}
+    return store
+
+def save_calendar_store(store):
+    os.makedirs(os.path.dirname(LC_CALENDAR_PATH) or ".", exist_ok=True)
+    tmp = LC_CALENDAR_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(store, f, sort_keys=True, separators=(",", ":"))
+    os.replace(tmp, LC_CALENDAR_PATH)
+
+def parse_calendar(raw):
+    """submissionCalendar (a JSON string of {epoch-seconds: count}) -> dict."""
+    try:
+        return {str(k): int(v) for k, v in json.loads(raw or "{}").items()}
+    except (TypeError, ValueError):
+        return {}
+
+def update_calendar_store(username, cal_raw, cur_year):
+    """Fold this run's current-year calendar into the store, fetch any past
+    active year we do not have yet (all of them in one aliased request), and
+    return the merged {epoch-seconds: count} calendar across every year."""
+    with profiling.phase("parse"):
+        store = load_calendar_store(username)
+    years = store["years"]
+    if cal_raw.get("submissionCalendar") is not None:
+        years[str(cur_year)] = {"complete": False,
+                                "calendar": parse_calendar(cal_raw["submissionCalendar"])}
+
+    # last year's partial copy (stored while it was current) is not "complete",
+    # so it is re-fetched once in full after New Year and then frozen
+    missing = [y for y in (cal_raw.get("activeYears") or [])
+               if y < cur_year and not years.get(str(y), {}).get("complete")]
+    if missing:
+        print(f"[LC] fetching past calendar years {missing}", flush=True)
+        fields = {f"y{y}": f"matchedUser(username:$u){{ userCalendar(year:{y}){{ submissionCalendar }} }}"
+                  for y in missing}
+        got = safe(lambda: lc_batch(fields, {"u": username}, "$u:String!", "calendarYears"),
+                   "LC-years") or {}
+        for y in missing:
+            cal = ((got.get(f"y{y}") or {}).get("userCalendar") or {})
+            if cal.get("submissionCalendar") is not None:
+                years[str(y)] = {"complete": True,
+                                 "calendar": parse_calendar(cal["submissionCalendar"])}
+    with profiling.phase("write"):
+        save_calendar_store(store)
+
+    with profiling.phase("aggregate"):
+        merged = {}
+        for entry in years.values():
+            merged.update(entry["calendar"])
+    return merged
+
+def leetcode_snapshot(username: str, refresh: bool = False) -> dict:
+    """Raw LC_FIELDS result for one user — shared with fetch_leetcode.py."""
+    cur_year = datetime.now(timezone.utc).year
+    return snapshots.cached(
+        "leetcode", f"{username}@{cur_year}",
+        lambda: lc_batch(LC_FIELDS, {"u": username, "year": cur_year}),
+        ok=lambda d: d.get("stats"), refresh=refresh)
+
+def fetch_leetcode(username: str) -> dict:
+    cur_year = datetime.now(timezone.utc).year
+    got = leetcode_snapshot(username, refresh=True)
+
+    # ── solved counts + beats + ranking ───────────────────────────────────────
+    user       = got.get("stats") or {}
+    all_q      = {x["difficulty"]: x["count"] for x in (got.get("allQuestionsCount") or [])}
     sub_stats  = user.get("submitStatsGlobal", {})
     counts     = {s["difficulty"]: s["count"] for s in sub_stats.get("acSubmissionNum", [])}
     beats      = {b["difficulty"]: b["percentage"] for b in (user.get("problemsSolvedBeatsStats") or [])}
@@ -180,33 +424,15 @@ def fetch_leetcode(username: str) -> dict:
     ranking    = profile.get("ranking", 0)
     reputation = profile.get("reputation", 0)
 
-    # ── query 2: language stats ───────────────────────────────────────────────
-    q2 = """
-    query q2($u:String!){
-      matchedUser(username:$u){
-        languageProblemCount { languageName problemsSolved }
-      }
-    }"""
-    d2 = safe(lambda: lc_query(q2, {"u": username}), "LC-q2") or {}
-    lang_raw = ((d2.get("matchedUser") or {}).get("languageProblemCount") or [])
+    # ── languages ─────────────────────────────────────────────────────────────
+    lang_raw = ((got.get("langs") or {}).get("languageProblemCount") or [])
     languages = sorted(
         [{"lang": x["languageName"], "solved": x["problemsSolved"]} for x in lang_raw],
         key=lambda x: -x["solved"]
     )[:6]
 
-    # ── query 3: skill tags ───────────────────────────────────────────────────
-    q3 = """
-    query q3($u:String!){
-      matchedUser(username:$u){
-        tagProblemCounts {
-          advanced     { tagName problemsSolved }
-          intermediate { tagName problemsSolved }
-          fundamental  { tagName problemsSolved }
-        }
-      }
-    }"""
-    d3 = safe(lambda: lc_query(q3, {"u": username}), "LC-q3") or {}
-    tpc = ((d3.get("matchedUser") or {}).get("tagProblemCounts") or {})
+    # ── skill tags ────────────────────────────────────────────────────────────
+    tpc = ((got.get("tags") or {}).get("tagProblemCounts") or {})
     skills = []
     for tier in ["advanced", "intermediate", "fundamental"]:
         for t in (tpc.get(tier) or []):
@@ -214,33 +440,20 @@ def fetch_leetcode(username: str) -> dict:
     skills.sort(key=lambda x: -x["solved"])
     top_skills = skills[:8]
 
-    # ── query 4: submission calendar (activity heatmap) ───────────────────────
-    q4 = """
-    query q4($u:String!,$year:Int){
-      matchedUser(username:$u){
-        userCalendar(year:$year){
-          activeYears
-          streak
-          totalActiveDays
-          submissionCalendar
-        }
-      }
-    }"""
-    cur_year = datetime.now(timezone.utc).year
-    d4 = safe(lambda: lc_query(q4, {"u": username, "year": cur_year}), "LC-q4") or {}
-    cal_raw  = ((d4.get("matchedUser") or {}).get("userCalendar") or {})
+    # ── submission calendar ───────────────────────────────────────────────────
+    cal_raw  = ((got.get("calendar") or {}).get("userCalendar") or {})
     lc_streak       = cal_raw.get("streak", 0)
     total_active    = cal_raw.get("totalActiveDays", 0)
-    sub_calendar_str= cal_raw.get("submissionCalendar", "{}")
-    # parse calendar: {"timestamp": count, ...} — keep last 30 days
-    try:
-        cal_dict = json.loads(sub_calendar_str)
+    # merged across all active years; keep last 30 days for the page
+    cal_dict = safe(lambda: update_calendar_store(username, cal_raw, cur_year), "LC-calendar") \
+        or parse_calendar(cal_raw.get("submissionCalendar"))
+    with profiling.phase("aggregate"):
         now_ts   = int(datetime.now(timezone.utc).timestamp())
         day_secs = 86400
         cal_30   = {k: v for k, v in cal_dict.items()
                     if now_ts - int(k) <= 30 * day_secs}
-    except Exception:
-        cal_30 = {}
+        series   = DailySeries.from_calendar(cal_dict, end=datetime.now(timezone.utc).date())
+        activity = {**series.stats(), "series": series.to_dict()}
 
     return {
         "username":     username,
@@ -262,6 +475,7 @@ def fetch_leetcode(username: str) -> dict:
         "languages":    languages,
         "topSkills":    top_skills,
         "calendar30":   cal_30,
+        "activity":     activity,
         "lastUpdated":  utcnow(),
     }
 
@@ -278,71 +492,494 @@ WEEK_PATTERNS = [
     "case study #{n}","case-study-#{n}","{n}",
 ]
 
-def fetch_sql(repo: str, token: str = "") -> dict:
+GH_API = "https://api.github.com"
+# "graphql" (one request for every folder, needs a token) or "rest"
+SQL_COUNT_MODE = os.environ.get("SQL_COUNT_MODE", "graphql").strip().lower()
+
+def gh_headers(token):
     hdrs = {"Accept": "application/vnd.github+json", "User-Agent": "dashboard-action"}
     if token:
         hdrs["Authorization"] = f"Bearer {token}"
-    contents = safe(
-        lambda: http_get(f"https://api.github.com/repos/{repo}/contents", headers=hdrs),
-        "SQL-contents"
-    )
+    return hdrs
+
+def sql_counts_graphql(repo, folders, token):
+    """{n: commit count} for every folder via history(path:).totalCount, one request."""
+    owner, name = repo.split("/", 1)
+    fields = "\n".join(f"w{n}: history(path:{json.dumps(f)}){{ totalCount }}"
+                       for n, f in folders.items())
+    query = f"""
+    query($owner:String!,$name:String!){{
+      repository(owner:$owner,name:$name){{
+        defaultBranchRef{{ target{{ ... on Commit {{
+          {fields}
+        }} }} }}
+      }}
+    }}"""
+    resp = http_post_json(f"{GH_API}/graphql",
+                          {"query": query, "variables": {"owner": owner, "name": name}},
+                          headers=gh_headers(token), label="gh.graphql.history")
+    if resp.get("errors"):
+        raise RuntimeError(f"GraphQL errors: {resp['errors']}")
+    target = resp["data"]["repository"]["defaultBranchRef"]["target"]
+    return {n: target[f"w{n}"]["totalCount"] for n in folders}
+
+def sql_counts_rest(repo, folders, token):
+    """{n: commit count} via /commits?path=, paging past 100 so counts match GraphQL."""
+    hdrs = gh_headers(token)
+
+    def commit_count(n, folder):
+        total, page = 0, 1
+        while True:
+            cl = safe(
+                lambda: http_get(
+                    f"{GH_API}/repos/{repo}/commits"
+                    f"?path={urllib.parse.quote(folder)}&per_page=100&page={page}",
+                    headers=hdrs, label="gh.commits"),
+                f"SQL-commits-{n}"
+            )
+            if not isinstance(cl, list):
+                return total or 1
+            total += len(cl)
+            if len(cl) < 100:
+                return total
+            page += 1
+
+    return fan_out({n: (lambda n=n, f=f: commit_count(n, f))
+                    for n, f in folders.items()})
+
+def sql_counts(repo, folders, token):
+    if not folders:
+        return {}
+    if SQL_COUNT_MODE == "graphql" and token:
+        counts = safe(lambda: sql_counts_graphql(repo, folders, token), "SQL-graphql")
+        if counts is not None:
+            return counts
+        print("[SQL] GraphQL failed — falling back to REST", file=sys.stderr)
+    return sql_counts_rest(repo, folders, token)
+
+def fetch_sql(repo: str, token: str = "") -> dict:
+    contents = http_get(f"{GH_API}/repos/{repo}/contents", headers=gh_headers(token),
+                        label="gh.contents")
     if not contents:
         return None
     folder_map = {item["name"].lower(): item["name"]
                   for item in contents if item["type"] == "dir"}
     print(f"[SQL] folders: {list(folder_map.keys())}", flush=True)
 
-    weeks = []
+    folders = {}
     for n in range(1, 9):
-        folder = next(
+        folders[n] = next(
             (folder_map[pat.format(n=n).lower()]
              for pat in WEEK_PATTERNS
              if pat.format(n=n).lower() in folder_map),
             None
         )
-        commits = 0
-        if folder:
-            cl = safe(
-                lambda f=folder: http_get(
-                    f"https://api.github.com/repos/{repo}/commits"
-                    f"?path={urllib.parse.quote(f)}&per_page=100",
-                    headers=hdrs),
-                f"SQL-commits-{n}"
-            )
-            commits = len(cl) if isinstance(cl, list) else 1
+
+    counts = sql_counts(repo, {n: f for n, f in folders.items() if f}, token)
+
+    weeks = []
+    for n in range(1, 9):
+        commits = counts.get(n, 0)
         weeks.append({"n": n, "name": WEEK_NAMES[n-1],
-                      "folder": folder, "commits": commits, "done": commits >= 3})
+                      "folder": folders[n], "commits": commits, "done": commits >= 3})
     return {"repo": repo, "weeks": weeks, "lastUpdated": utcnow()}
 
+# ── partial refresh from a repository_dispatch (sql-update) payload ─────────
+def dispatch_payload(argv):
+    """client_payload of the triggering dispatch, or None for a full refresh.
+
+    Read from `--dispatch FILE` (a bare payload) or, inside Actions, from the
+    repository_dispatch event in GITHUB_EVENT_PATH.
+    """
+    if "--dispatch" in argv:
+        with open(argv[argv.index("--dispatch") + 1], "r", encoding="utf-8") as f:
+            return json.load(f)
+    if os.environ.get("GITHUB_EVENT_NAME") != "repository_dispatch":
+        return None
+    try:
+        with open(os.environ["GITHUB_EVENT_PATH"], "r", encoding="utf-8") as f:
+            return json.load(f).get("client_payload") or None
+    except (KeyError, OSError, ValueError):
+        return None
+
+def changed_paths(payload):
+    """Paths touched by the dispatching push: payload["paths"] and/or the
+    added/modified/removed lists of payload["commits"] (push-event shape)."""
+    paths = set(payload.get("paths") or [])
+    for c in payload.get("commits") or []:
+        for key in ("added", "modified", "removed"):
+            paths.update(c.get(key) or [])
+    return paths
+
+def refresh_sql_partial(payload, sql, token):
+    """Re-count only the weeks whose folders the payload touched.
+
+    Returns the updated sql section, or None when a full fetch_sql is needed:
+    no usable paths, no previous data, or a change in a week folder we have
+    not seen yet.
+    """
+    paths = changed_paths(payload)
+    if not paths or not sql or not sql.get("weeks"):
+        return None
+    by_folder = {w["folder"].lower(): w for w in sql["weeks"] if w.get("folder")}
+    patterns  = {pat.format(n=n).lower() for n in range(1, 9) for pat in WEEK_PATTERNS}
+    touched = {}
+    for p in paths:
+        top = p.strip("/").split("/", 1)[0].lower()
+        if top in by_folder:
+            w = by_folder[top]
+            touched[w["n"]] = w["folder"]
+        elif top in patterns and "/" in p.strip("/"):
+            return None                       # a new week folder appeared
+    print(f"[SQL] partial refresh of weeks {sorted(touched)}", flush=True)
+    if not touched:
+        return sql
+    counts = sql_counts(sql["repo"], touched, token)
+    for w in sql["weeks"]:
+        if w["n"] in counts:
+            w["commits"] = counts[w["n"]]
+            w["done"]    = w["commits"] >= 3
+    sql["lastUpdated"] = utcnow()
+    return sql
+
+def partial_refresh(payload, out_path, sql_repo, token):
+    """Merge a dispatch-driven SQL update into the existing data.json.
+    Returns False when the caller should fall back to a full refresh."""
+    try:
+        with open(out_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    old = data.get("sql")
+    if not old or old.get("repo") != sql_repo:
+        return False
+    sql = refresh_sql_partial(payload, old, token)
+    if sql is None:
+        return False
+    data["sql"] = sql
+    data["generatedAt"] = utcnow()
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    shards.write_shards(data)
+    print(f"\n✓ Updated sql in {out_path}", flush=True)
+    print(f"  SQL: {sum(1 for w in sql['weeks'] if w['done'])}/8 done")
+    return True
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  TEAM (roster mode)
+# ═══════════════════════════════════════════════════════════════════════════════
+# With TEAM_ROSTER pointing at a JSON list of members
+#   [{"name": "Ana", "leetcode": "ana_lc", "monkeytype": "ana_mt"}, ...]
+# data.json gets a "team" section: one entry per member plus precomputed
+# leaderboards. LeetCode users are fetched TEAM_LC_BATCH at a time as aliased
+# matchedUser fields of one document (m0: matchedUser(username:$u0) ...), so
+# requests grow with the number of batches, not members. Monkeytype has no
+# batch endpoint; public profiles are fetched TEAM_MT_WORKERS at a time.
+# Each member is snapshotted separately, so within the TTL only members whose
+# snapshot expired are fetched again.
+TEAM_ROSTER     = os.environ.get("TEAM_ROSTER", "")
+TEAM_LC_BATCH   = max(1, int(os.environ.get("TEAM_LC_BATCH", "") or 10))
+TEAM_MT_WORKERS = max(1, int(os.environ.get("TEAM_MT_WORKERS", "") or CONCURRENCY))
+
+# one member's selection; "$u" becomes that member's own variable
+TEAM_LC_MEMBER = """matchedUser(username:$u){
+        profile { ranking }
+        submitStatsGlobal { acSubmissionNum { difficulty count } }
+        userCalendar(year:$year) { streak totalActiveDays }
+      }"""
+
+# board -> (member section, metric), highest first
+LEADERBOARDS = {
+    "solved":       ("leetcode",   "total"),
+    "hard":         ("leetcode",   "hard"),
+    "lcStreak":     ("leetcode",   "streak"),
+    "wpm":          ("monkeytype", "bestWpm"),
+    "typingStreak": ("monkeytype", "streak"),
+}
+
+def load_roster(path=TEAM_ROSTER):
+    with open(path, "r", encoding="utf-8") as f:
+        members = json.load(f)
+    return [{"name":       m.get("name") or m.get("leetcode") or m.get("monkeytype"),
+             "leetcode":   m.get("leetcode"),
+             "monkeytype": m.get("monkeytype")} for m in members]
+
+def team_leetcode(usernames):
+    """{username: matchedUser} for every user that exists, in aliased batches."""
+    year = datetime.now(timezone.utc).year
+    got, stale = {}, []
+    for u in dict.fromkeys(usernames):
+        snap = snapshots.load("leetcode-member", f"{u}@{year}") if snapshots.ENABLED else None
+        if snap is not None:
+            got[u] = snap
+        else:
+            stale.append(u)
+    batches = [stale[i:i + TEAM_LC_BATCH] for i in range(0, len(stale), TEAM_LC_BATCH)]
+    print(f"[TEAM] LeetCode: {len(got)} fresh, {len(stale)} to fetch in {len(batches)} batch(es)",
+          flush=True)
+
+    def fetch_batch(n, users):
+        fields = {f"m{i}": re.sub(r"\$u\b", f"$u{i}", TEAM_LC_MEMBER) for i in range(len(users))}
+        var_defs = ",".join(f"$u{i}:String!" for i in range(len(users))) + ",$year:Int"
+        variables = {**{f"u{i}": u for i, u in enumerate(users)}, "year": year}
+        data = lc_batch(fields, variables, var_defs, f"team{n}")
+        return {u: data.get(f"m{i}") for i, u in enumerate(users)}
+
+    parts = fan_out({n: (lambda n=n, users=users:
+                         safe(lambda: fetch_batch(n, users), f"LC-team-{n}") or {})
+                     for n, users in enumerate(batches)})
+    for part in parts.values():
+        for u, raw in part.items():
+            if raw:                          # null: no such user (or its field failed)
+                snapshots.save("leetcode-member", f"{u}@{year}", raw)
+                got[u] = raw
+    return got
+
+def team_monkeytype(usernames):
+    """{username: public profile data}, at most TEAM_MT_WORKERS requests at a time."""
+    base = "https://api.monkeytype.com"
+
+    def profile(u):
+        return snapshots.cached("monkeytype-profile", u, lambda: safe(
+            lambda: (http_get(f"{base}/users/{urllib.parse.quote(u)}/profile?isUid=false",
+                              label="mt.profile") or {}).get("data"),
+            f"MT-{u}"))
+
+    return fan_out({u: (lambda u=u: profile(u)) for u in dict.fromkeys(usernames)},
+                   workers=TEAM_MT_WORKERS)
+
+def team_lc_entry(raw):
+    counts = {s["difficulty"]: s["count"]
+              for s in (raw.get("submitStatsGlobal") or {}).get("acSubmissionNum") or []}
+    cal = raw.get("userCalendar") or {}
+    return {"total":  counts.get("All", 0),    "easy": counts.get("Easy", 0),
+            "medium": counts.get("Medium", 0), "hard": counts.get("Hard", 0),
+            "ranking": (raw.get("profile") or {}).get("ranking") or 0,
+            "streak": cal.get("streak", 0), "totalActiveDays": cal.get("totalActiveDays", 0)}
+
+def team_mt_entry(pdata):
+    pbs = parse_personal_bests(pdata.get("personalBests") or {})
+    stats = pdata.get("typingStats") or {}
+    return {"streak":         pdata.get("streak", 0),
+            "maxStreak":      pdata.get("maxStreak", 0),
+            "completedTests": stats.get("completedTests", 0),
+            "hoursTyped":     round(stats.get("timeTyping", 0) / 3600, 1),
+            "xp":             pdata.get("xp", 0),
+            "bestWpm":        max((p["wpm"] for p in pbs.values()), default=0),
+            "personalBests":  pbs}
+
+def leaderboard(members, section, metric):
+    """[{rank, name, value}] best first; ties share a rank."""
+    rows = sorted(((m[section][metric], m["name"]) for m in members if m[section]),
+                  key=lambda r: (-r[0], r[1]))
+    board, rank = [], 0
+    for i, (value, name) in enumerate(rows):
+        if i == 0 or value != rows[i - 1][0]:
+            rank = i + 1
+        board.append({"rank": rank, "name": name, "value": value})
+    return board
+
+def fetch_team(roster):
+    got = fan_out({
+        "leetcode":   lambda: team_leetcode([m["leetcode"] for m in roster if m["leetcode"]]),
+        "monkeytype": lambda: team_monkeytype([m["monkeytype"] for m in roster if m["monkeytype"]]),
+    })
+    members = []
+    for m in roster:
+        lc = got["leetcode"].get(m["leetcode"]) if m["leetcode"] else None
+        mt = got["monkeytype"].get(m["monkeytype"]) if m["monkeytype"] else None
+        members.append({**m,
+                        "leetcode":   {"username": m["leetcode"], **team_lc_entry(lc)} if lc else None,
+                        "monkeytype": {"username": m["monkeytype"], **team_mt_entry(mt)} if mt else None})
+    print(f"[TEAM] {len(members)} members: "
+          f"{sum(1 for m in members if m['leetcode'])} LeetCode, "
+          f"{sum(1 for m in members if m['monkeytype'])} Monkeytype", flush=True)
+    return {"members":     members,
+            "leaderboard": {board: leaderboard(members, section, metric)
+                            for board, (section, metric) in LEADERBOARDS.items()},
+            "lastUpdated": utcnow()}
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  MAIN
 # ═══════════════════════════════════════════════════════════════════════════════
-def main():
-    ape_key  = os.environ.get("MONKEYTYPE_APE_KEY", "").strip()
-    gh_token = os.environ.get("GITHUB_TOKEN", "")
-    sql_repo = os.environ.get("SQL_REPO",      "LekhanaMitta/8WeekSQLChallenge")
-    lc_user  = os.environ.get("LC_USERNAME",   "LekhanaRM")
-    mt_user  = os.environ.get("MT_USERNAME",   "theUnbeknownst")
-    out_path = os.environ.get("DATA_JSON_PATH", "data.json")
+# ── stale-while-revalidate ───────────────────────────────────────────────────
+# A source that fails (or answers with an empty/zeroed payload) is retried
+# with backoff inside the same run; if it still fails, data.json keeps the
+# section's last good value, tagged stale, instead of publishing zeros.
+FETCH_RETRIES = int(os.environ.get("FETCH_RETRIES", "") or 2)
+FETCH_BACKOFF = float(os.environ.get("FETCH_BACKOFF", "") or 5)     # seconds
+STALE_MERGE   = os.environ.get("STALE_MERGE", "1") != "0"
+ERRORS = {}
 
-    print("── Monkeytype ──────────────────────", flush=True)
-    mt = fetch_monkeytype(mt_user, ape_key)
+def degenerate(section, data):
+    """True when a fetch "succeeded" but produced nothing worth publishing."""
+    if not data:
+        return True
+    if section == "monkeytype":
+        return not data.get("completedTests") and not data.get("personalBests")
+    if section == "leetcode":
+        return not data.get("total") and not data.get("ranking")
+    if section == "team":
+        return not any(m["leetcode"] or m["monkeytype"] for m in data.get("members") or [])
+    return False
 
-    print("── LeetCode ────────────────────────", flush=True)
-    lc = fetch_leetcode(lc_user)
+def fetch_section(section, fn):
+    """fn(), retried up to FETCH_RETRIES times (exponential backoff) while it
+    raises or returns degenerate data. Returns the last result; why it
+    finally failed is kept in ERRORS[section]."""
+    ERRORS.pop(section, None)
+    for attempt in range(FETCH_RETRIES + 1):
+        if attempt:
+            delay = FETCH_BACKOFF * 2 ** (attempt - 1)
+            print(f"[{section}] retry {attempt}/{FETCH_RETRIES} in {delay:.0f}s", flush=True)
+            time.sleep(delay)
+        try:
+            data, err = fn(), None
+        except Exception as e:
+            data, err = None, f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        if err is None and degenerate(section, data):
+            err = "empty or zeroed response"
+        if err is None:
+            return data
+        print(f"[{section}] ERROR: {err}", file=sys.stderr)
+    ERRORS[section] = err
+    return data
 
-    print("── 8-Week SQL ──────────────────────", flush=True)
-    sql = fetch_sql(sql_repo, gh_token)
+def merge_stale(section, fresh, previous):
+    """fresh when usable, otherwise the previous good value marked stale."""
+    if not degenerate(section, fresh) or degenerate(section, previous):
+        return fresh
+    print(f"[{section}] keeping last good data from {previous.get('lastUpdated')}",
+          file=sys.stderr)
+    return {**previous,
+            "stale":      True,
+            "staleSince": previous.get("staleSince") or utcnow(),
+            "lastError":  ERRORS.get(section, "empty or zeroed response")}
 
+def write_data_json(out_path, mt, lc, sql, team=None):
+    if STALE_MERGE:
+        try:
+            with open(out_path, "r", encoding="utf-8") as f:
+                prev = json.load(f)
+        except (OSError, ValueError):
+            prev = {}
+        mt  = merge_stale("monkeytype", mt,  prev.get("monkeytype"))
+        lc  = merge_stale("leetcode",   lc,  prev.get("leetcode"))
+        sql = merge_stale("sql",        sql, prev.get("sql"))
+        if TEAM_ROSTER:
+            team = merge_stale("team", team, prev.get("team"))
     payload = {"generatedAt": utcnow(),
                "monkeytype": mt, "leetcode": lc, "sql": sql}
+    if team is not None:
+        payload["team"] = team
 
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2)
-    print(f"\n✓ Wrote {out_path}", flush=True)
+    shards.write_shards(payload)
+    print(f"\n✓ Wrote {out_path} (+ shards in {shards.SHARD_DIR})", flush=True)
     if mt: print(f"  MT:  {len(mt.get('personalBests',{}))} PB modes, streak={mt.get('streak')}")
     if lc: print(f"  LC:  {lc.get('total')} solved, rank={lc.get('ranking')}")
     if sql:print(f"  SQL: {sum(1 for w in sql['weeks'] if w['done'])}/8 done")
+    if team:
+        top = (team["leaderboard"]["solved"] or [{}])[0]
+        print(f"  TEAM: {len(team['members'])} members, most solved: {top.get('name')} ({top.get('value')})")
+    for label, section in payload.items():
+        if isinstance(section, dict) and section.get("stale"):
+            print(f"  {label}: STALE since {section['staleSince']} ({section['lastError']})")
+
+# ── dry-run plan ──────────────────────────────────────────────────────────────
+def plan_calls(mt_user, ape_key, lc_user, sql_repo, token, out_path="data.json"):
+    """Expected requests per source for the next run, from local state only:
+    [(source, resource, headers, min, max, note), ...] for ratelimit.report()."""
+    try:
+        with open(out_path, "r", encoding="utf-8") as f:
+            prev = json.load(f)
+    except (OSError, ValueError):
+        prev = {}
+    rows = []
+    fresh = lambda provider, key: snapshots.ENABLED and snapshots.load(provider, key) is not None
+
+    if not ape_key:
+        rows.append(("monkeytype", "api.monkeytype.com", None, 1, 1, "profile"))
+    else:
+        auth = {"Authorization": f"ApeKey {ape_key}"}
+        if mt_history.stored_count():
+            rows.append(("monkeytype", "api.monkeytype.com", auth, 2, 2,
+                         "profile + results since last stored"))
+        else:
+            tests = ((prev.get("monkeytype") or {}).get("completedTests") or 0)
+            rows.append(("monkeytype", "api.monkeytype.com", auth, 2, 2 + tests // MT_PAGE,
+                         "profile + full result history"))
+
+    cur_year = datetime.now(timezone.utc).year
+    years = load_calendar_store(lc_user)["years"]
+    extra = 0 if years.get(str(cur_year - 1), {}).get("complete") else 1
+    rows.append(("leetcode", "leetcode.com", None, 1, 1 + extra,
+                 "batch" + (" + past calendar years" if extra else "")))
+
+    hdrs = gh_headers(token)
+    if SQL_COUNT_MODE == "graphql" and token:
+        rows.append(("sql", "api.github.com/core", hdrs, 1, 1, "contents"))
+        rows.append(("sql", "api.github.com/graphql", hdrs, 1, 1, "history counts"))
+    else:
+        folders = sum(1 for w in ((prev.get("sql") or {}).get("weeks") or []) if w.get("folder"))
+        rows.append(("sql", "api.github.com/core", hdrs, 1 + folders, 1 + folders,
+                     f"contents + {folders} folder(s)"))
+
+    if TEAM_ROSTER:
+        roster = load_roster()
+        stale = lambda provider, users, key=str: [
+            u for u in dict.fromkeys(users) if not fresh(provider, key(u))]
+        lc = stale("leetcode-member", [m["leetcode"] for m in roster if m["leetcode"]],
+                   lambda u: f"{u}@{cur_year}")
+        mt = stale("monkeytype-profile", [m["monkeytype"] for m in roster if m["monkeytype"]])
+        batches = -(-len(lc) // TEAM_LC_BATCH)
+        rows.append(("team", "leetcode.com", None, batches, batches,
+                     f"{len(lc)} member(s) in {batches} aliased batch(es)"))
+        rows.append(("team", "api.monkeytype.com", None, len(mt), len(mt),
+                     f"{len(mt)} profile(s)"))
+    return rows
+
+def main():
+    ape_key  = os.environ.get("MONKEYTYPE_APE_KEY", "").strip()
+    gh_token = os.environ.get("GITHUB_TOKEN", "")
+    sql_repo = os.environ.get("SQL_REPO",      "LekhanaMitta/8WeekSQLChallenge")
+    lc_user  = os.environ.get("LC_USERNAME",   "LekhanaRM")
+    mt_user  = os.environ.get("MT_USERNAME",   "theUnbeknownst")
+    out_path = os.environ.get("DATA_JSON_PATH", "data.json")
+
+    if "--plan" in sys.argv[1:]:
+        rows = plan_calls(mt_user, ape_key, lc_user, sql_repo, gh_token, out_path)
+        return 0 if ratelimit.report(rows) else 1
+
+    payload = dispatch_payload(sys.argv[1:])
+    if payload is not None:
+        print("── Dispatch: partial SQL refresh ───", flush=True)
+        if partial_refresh(payload, out_path, sql_repo, gh_token):
+            return
+        print("[SQL] partial refresh not possible — doing a full refresh", flush=True)
+
+    print(f"── Fetching (concurrency={CONCURRENCY}) ────────", flush=True)
+    t0 = time.perf_counter()
+    jobs = {
+        "monkeytype": lambda: fetch_monkeytype(mt_user, ape_key),
+        "leetcode":   lambda: fetch_leetcode(lc_user),
+        "sql":        lambda: fetch_sql(sql_repo, gh_token),
+    }
+    if TEAM_ROSTER:
+        roster = load_roster()
+        jobs["team"] = lambda: fetch_team(roster)
+    got = fan_out({label: (lambda label=label, fn=fn:
+                           timed(label, lambda: fetch_section(label, fn)))
+                   for label, fn in jobs.items()})
+    mt, lc, sql = got["monkeytype"], got["leetcode"], got["sql"]
+    for label, secs in TIMINGS.items():
+        print(f"  [time] {label:<11} {secs:6.2f}s", flush=True)
+    print(f"  [time] {'total':<11} {time.perf_counter() - t0:6.2f}s", flush=True)
+
+    with profiling.phase("write"):
+        write_data_json(out_path, mt, lc, sql, got.get("team"))
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(profiling.run(main))
@@ -1,50 +1,10 @@
 import os
 import json
-import requests
-from datetime import datetime
+from datetime import datetime, timezone
 
-LEETCODE_GRAPHQL = "https://leetcode.com/graphql"
-
-QUERY = """
-query userProfile($username: String!) {
-  matchedUser(username: $username) {
-    username
-    profile {
-      ranking
-      userAvatar
-      realName
-      reputation
-      starRating
-    }
-    submitStatsGlobal {
-      acSubmissionNum {
-        difficulty
-        count
-        submissions
-      }
-    }
-    submissionCalendar
-  }
-}
-"""
-
-def build_session():
-    s = requests.Session()
-    s.headers.update({
-        "Content-Type": "application/json",
-        "Referer": "https://leetcode.com",
-        "User-Agent": "Mozilla/5.0",
-    })
-
-    leetcode_session = os.getenv("LEETCODE_SESSION")
-    csrf = os.getenv("LEETCODE_CSRF")
-
-    if leetcode_session and csrf:
-        s.cookies.set("LEETCODE_SESSION", leetcode_session, domain=".leetcode.com")
-        s.cookies.set("csrftoken", csrf, domain=".leetcode.com")
-        s.headers["x-csrftoken"] = csrf
-
-    return s
+import profiling
+from activity import DailySeries
+from fetch_data import leetcode_snapshot
 
 def pct(ac_count: int, submissions: int):
     """Return acceptance rate as a percentage float (0..100) or None."""
@@ -55,21 +15,9 @@ def pct(ac_count: int, submissions: int):
 def main():
     username = os.environ["LEETCODE_USERNAME"]
 
-    payload = {
-        "query": QUERY,
-        "variables": {"username": username},
-        "operationName": "userProfile",
-    }
-
-    s = build_session()
-    r = s.post(LEETCODE_GRAPHQL, data=json.dumps(payload), timeout=30)
-    r.raise_for_status()
-
-    data = r.json()
-    if "errors" in data:
-        raise RuntimeError(f"GraphQL errors: {data['errors']}")
-
-    user = data["data"]["matchedUser"]
+    # Shared with fetch_data.py: reused while fresh, otherwise one batched query.
+    # LEETCODE_SESSION / LEETCODE_CSRF are picked up by fetch_data's headers.
+    user = leetcode_snapshot(username).get("stats")
     if not user:
         raise RuntimeError("User not found (matchedUser is null). Check username.")
 
@@ -85,6 +33,11 @@ def main():
         for diff in ["Easy", "Medium", "Hard", "All"]
     }
 
+    with profiling.phase("parse"):
+        calendar = json.loads(user.get("submissionCalendar") or "{}")
+    with profiling.phase("aggregate"):
+        activity = DailySeries.from_calendar(calendar, end=datetime.now(timezone.utc).date())
+
     out = {
         "username": user["username"],
         "ranking": user["profile"]["ranking"],
@@ -110,14 +63,15 @@ def main():
             "All": acc_rate_by_diff.get("All"),
         },
         "submissionCalendar": user.get("submissionCalendar"),
+        "activity": activity.stats(),
         "generatedAt": datetime.utcnow().isoformat() + "Z",
     }
 
     os.makedirs("data", exist_ok=True)
-    with open("data/leetcode.json", "w", encoding="utf-8") as f:
+    with profiling.phase("write"), open("data/leetcode.json", "w", encoding="utf-8") as f:
         json.dump(out, f, indent=2)
 
     print("Wrote data/leetcode.json")
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+http_cache.py — on-disk conditional-request (ETag / Last-Modified) cache.
+
+http_client.http_get() stores every GET response with its validators. The
+next request for the same URL sends If-None-Match / If-Modified-Since, and on
+a 304 the stored body is returned instead. GitHub does not count 304s against
+the rate limit, so frequent refreshes cost almost nothing when nothing changed.
+
+Entries are keyed by URL + auth scope (a hash of the Authorization header), so
+responses fetched with one token are never replayed for another.
+
+  HTTP_CACHE_DIR        cache directory      (default ~/.cache/dashboard/http)
+  HTTP_CACHE_MAX_BYTES  total size limit     (default 50 MB)
+  HTTP_CACHE_MAX_AGE    drop entries older   (default 7 days, in seconds)
+  HTTP_CACHE=0          disable the cache entirely
+
+The directory lives outside the checkout on purpose: workflows restore it with
+actions/cache, and it must never end up in a commit or the Pages artifact.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+CACHE_DIR = os.path.expanduser(
+    os.environ.get("HTTP_CACHE_DIR", "~/.cache/dashboard/http"))
+MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES", "") or 50 * 1024 * 1024)
+MAX_AGE   = int(os.environ.get("HTTP_CACHE_MAX_AGE", "") or 7 * 86400)
+ENABLED   = os.environ.get("HTTP_CACHE", "1") != "0"
+
+_evict_registered = False
+_lock = threading.Lock()
+
+
+def auth_scope(headers):
+    """Short fingerprint of the credentials a request was made with."""
+    auth = next((v for k, v in (headers or {}).items()
+                 if k.lower() == "authorization"), "")
+    if not auth:
+        return "anon"
+    return hashlib.sha256(auth.encode()).hexdigest()[:16]
+
+
+def cache_key(url, headers=None):
+    return hashlib.sha256(f"{auth_scope(headers)} {url}".encode()).hexdigest()
+
+
+def _path(key):
+    return os.path.join(CACHE_DIR, key + ".json")
+
+
+def load(key):
+    """Stored entry for key, or None when missing, unreadable or too old."""
+    try:
+        with open(_path(key), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("storedAt", 0) > MAX_AGE:
+        return None
+    return entry
+
+
+def save(key, url, etag, last_modified, body):
+    global _evict_registered
+    entry = {"url": url, "etag": etag, "lastModified": last_modified,
+             "storedAt": time.time(), "body": body}
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, _path(key))
+    with _lock:
+        if not _evict_registered:
+            atexit.register(evict)
+            _evict_registered = True
+
+
+def touch(key, entry):
+    """Refresh an entry's age after the server confirmed it with a 304."""
+    save(key, entry["url"], entry.get("etag"), entry.get("lastModified"), entry["body"])
+
+
+def evict():
+    """Drop expired entries, then the oldest ones until under MAX_BYTES."""
+    try:
+        names = [n for n in os.listdir(CACHE_DIR) if n.endswith(".json")]
+    except OSError:
+        return
+    now, files = time.time(), []
+    for n in names:
+        p = os.path.join(CACHE_DIR, n)
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        if now - st.st_mtime > MAX_AGE:
+            os.remove(p)
+        else:
+            files.append((st.st_mtime, st.st_size, p))
+    total = sum(size for _, size, _ in files)
+    for _, size, p in sorted(files):
+        if total <= MAX_BYTES:
+            break
+        os.remove(p)
+        total -= size
+
+
+def validators(entry):
+    """Conditional-request headers for a stored entry."""
+    h = {}
+    if entry.get("etag"):
+        h["If-None-Match"] = entry["etag"]
+    if entry.get("lastModified"):
+        h["If-Modified-Since"] = entry["lastModified"]
+    return h
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+http_client.py — one keep-alive HTTP client shared by all dashboard scripts.
+
+urllib opens (and TLS-handshakes) a fresh connection for every call. Here
+connections are kept in small per-host pools and reused, responses are
+requested gzip-compressed, and GETs are revalidated through http_cache.
+
+  http_get(url, headers)              -> parsed JSON   (conditional, cached)
+  http_post_json(url, body, headers)  -> parsed JSON
+  request(method, url, ...)           -> Response(status, headers, body)
+
+Any status >= 400 raises HTTPError, which carries .code, .body and .headers.
+Rate limits are respected and rate-limited responses retried (ratelimit.py).
+
+HTTP_BASE_OVERRIDE=http://127.0.0.1:8765 sends every request to that origin
+instead (the real host travels in X-Original-Host) — see standin_server.py;
+HTTP_RECORD=<file> records responses into a cassette (cassette.py);
+TRACE_DIR=<dir> writes a per-request trace and metrics (tracing.py).
+Pools are thread-safe: a connection is checked out by one request at a time.
+"""
+
+import atexit
+import gzip
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.parse
+import zlib
+from collections import namedtuple
+
+import cassette
+import http_cache
+import profiling
+import ratelimit
+import tracing
+
+Response = namedtuple("Response", "status headers body")
+
+MAX_IDLE_PER_HOST = 8
+BASE_OVERRIDE = os.environ.get("HTTP_BASE_OVERRIDE", "").rstrip("/")
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection":      "keep-alive",
+    "User-Agent":      "dashboard-scripts",
+}
+
+# errors that mean "the server dropped an idle keep-alive socket" — safe to
+# retry once on a fresh connection
+_STALE = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+          http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+
+class HTTPError(Exception):
+    def __init__(self, url, code, body, headers):
+        self.url, self.code, self.body, self.headers = url, code, body, headers
+        super().__init__(f"HTTP {code} for {url}: {body[:200]!r}")
+
+
+_idle = {}                 # (scheme, host, port) -> [connection, ...]
+_idle_lock = threading.Lock()
+
+
+def _checkout(origin, timeout):
+    with _idle_lock:
+        pool = _idle.get(origin)
+        if pool:
+            conn = pool.pop()
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+    scheme, host, port = origin
+    cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    return cls(host, port, timeout=timeout), False
+
+
+def _checkin(origin, conn):
+    with _idle_lock:
+        pool = _idle.setdefault(origin, [])
+        if len(pool) < MAX_IDLE_PER_HOST:
+            pool.append(conn)
+            return
+    conn.close()
+
+
+def close_all():
+    with _idle_lock:
+        pools = list(_idle.values())
+        _idle.clear()
+    for pool in pools:
+        for conn in pool:
+            conn.close()
+
+
+atexit.register(close_all)
+
+
+def _decode(resp, raw):
+    enc = (resp.getheader("Content-Encoding") or "").lower()
+    if enc == "gzip":
+        return gzip.decompress(raw)
+    if enc == "deflate":
+        return zlib.decompress(raw)
+    return raw
+
+
+def _send(origin, method, path, hdrs, body, timeout):
+    for attempt in range(2):
+        conn, reused = _checkout(origin, timeout)
+        try:
+            conn.request(method, path, body=body, headers=hdrs)
+            resp = conn.getresponse()
+            raw  = resp.read()
+        except _STALE:
+            conn.close()
+            if reused and attempt == 0:
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            _checkin(origin, conn)
+        return Response(resp.status, resp.headers, _decode(resp, raw))
+
+
+def request(method, url, headers=None, body=None, timeout=20, label=None):
+    """Send one request over a pooled connection and return a Response.
+
+    Requests are paced by the host's rate-limit budget, and 429s, rate-limit
+    403s and 502-504s are retried with backoff (see ratelimit.py). `label`
+    names the endpoint in the trace.
+    """
+    parts  = urllib.parse.urlsplit(url)
+    host   = parts.hostname                     # budgets stay per real host
+    path   = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    hdrs = {**DEFAULT_HEADERS, **(headers or {})}
+    if BASE_OVERRIDE:
+        hdrs["X-Original-Host"] = parts.netloc
+        parts = urllib.parse.urlsplit(BASE_OVERRIDE)
+    origin = (parts.scheme, parts.hostname,
+              parts.port or (443 if parts.scheme == "https" else 80))
+
+    attempt, t0 = 0, time.perf_counter()
+    try:
+        with profiling.phase("fetch"):
+            while True:
+                ratelimit.acquire(host, hdrs, path)
+                resp  = _send(origin, method, path, hdrs, body, timeout)
+                delay = ratelimit.record(host, hdrs, resp.status, resp.headers, attempt, path)
+                if delay is None:
+                    break
+                ratelimit.wait_retry(host, delay, resp.status)
+                attempt += 1
+    except Exception as e:
+        if tracing.ENABLED:
+            tracing.record(host, label or tracing.default_label(method, path), method, None,
+                           time.perf_counter() - t0, 0, attempt, f"{type(e).__name__}: {e}")
+        raise
+    if tracing.ENABLED:
+        tracing.record(host, label or tracing.default_label(method, path), method, resp.status,
+                       time.perf_counter() - t0, len(resp.body), attempt)
+    if cassette.RECORDING:
+        cassette.record(method, url, body, resp)
+    return resp
+
+
+def _check(url, resp):
+    if resp.status >= 400:
+        raise HTTPError(url, resp.status,
+                        resp.body.decode("utf-8", errors="replace"), resp.headers)
+    return resp
+
+
+def http_get(url, headers=None, timeout=20, label=None):
+    """GET url as JSON, revalidating against the on-disk ETag cache."""
+    headers = dict(headers or {})
+    # a recording needs full bodies, not 304s
+    use_cache = http_cache.ENABLED and not cassette.RECORDING
+    key   = http_cache.cache_key(url, headers) if use_cache else None
+    entry = http_cache.load(key) if key else None
+    if entry:
+        headers.update(http_cache.validators(entry))
+
+    resp = request("GET", url, headers, timeout=timeout, label=label)
+    if resp.status == 304 and entry:
+        http_cache.touch(key, entry)
+        with profiling.phase("parse"):
+            return json.loads(entry["body"])
+    if resp.status == 304:
+        # validators the caller passed itself: we have no body to replay, so
+        # ask once more unconditionally
+        for h in ("If-None-Match", "If-Modified-Since"):
+            headers.pop(h, None)
+        resp = request("GET", url, headers, timeout=timeout, label=label)
+        if resp.status == 304:
+            raise HTTPError(url, 304, "304 Not Modified without a cached body", resp.headers)
+    body = _check(url, resp).body.decode()
+
+    etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    if key and (etag or modified):
+        http_cache.save(key, url, etag, modified, body)
+    with profiling.phase("parse"):
+        return json.loads(body)
+
+
+def http_post_json(url, body, headers=None, timeout=20, label=None):
+    """POST body as JSON and return the parsed JSON reply."""
+    h = {"Content-Type": "application/json", **(headers or {})}
+    resp = request("POST", url, h, body=json.dumps(body).encode(), timeout=timeout, label=label)
+    with profiling.phase("parse"):
+        return json.loads(_check(url, resp).body.decode())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+mt_history.py — persisted Monkeytype result history + per-mode aggregates.
+
+Results are stored column-wise: one typed array per field (timestamp, mode,
+wpm, raw, acc, consistency), each zlib-compressed and base64-encoded in a
+small JSON file. Loading years of tests is a handful of frombytes() calls.
+
+The fetcher only asks Monkeytype for results newer than latest_ts(); add()
+appends them. The per-mode aggregates (sorted WPM list for median/p90, best
+result, per-day counts and accuracy sums) are not stored: they are built in
+one pass over the columns the first time they are needed, and from then on
+add() updates them in place. Loading alone never touches them.
+"""
+
+import base64
+import bisect
+import json
+import os
+import sys
+import zlib
+from array import array
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+HISTORY_PATH = os.environ.get("MT_HISTORY_PATH", "data/monkeytype_history.json")
+DAY_MS       = 86_400_000
+
+# column name -> (array typecode, result key)
+COLUMNS = {
+    "ts":  ("q", "timestamp"),
+    "wpm": ("f", "wpm"),
+    "raw": ("f", "rawWpm"),
+    "acc": ("f", "acc"),
+    "con": ("f", "consistency"),
+}
+
+
+def mode_label(r):
+    m  = str(r.get("mode", "")).strip()
+    m2 = str(r.get("mode2", "")).strip()
+    return f"{m} {m2}".strip() if m2 else m
+
+
+def day_of(ts_ms):
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _pack(arr):
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return base64.b64encode(zlib.compress(arr.tobytes(), 9)).decode()
+
+
+def _unpack(typecode, blob):
+    arr = array(typecode)
+    arr.frombytes(zlib.decompress(base64.b64decode(blob)))
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class ModeStats:
+    """Running aggregates for one mode, updated one result at a time."""
+
+    def __init__(self):
+        self.wpms    = []                     # kept sorted
+        self.best    = None
+        self.top     = None                   # unrounded best wpm
+        self.per_day = defaultdict(lambda: [0, 0.0])   # day -> [tests, acc sum]
+
+    def add(self, wpm, raw, acc, con, ts):
+        bisect.insort(self.wpms, wpm)
+        if self.top is None or wpm > self.top:
+            self.top  = wpm
+            self.best = {"wpm": round(wpm, 1), "raw": round(raw, 1), "acc": round(acc, 1),
+                         "con": round(con, 1), "date": day_of(ts)}
+        d = self.per_day[day_of(ts)]
+        d[0] += 1
+        d[1] += acc
+
+    @classmethod
+    def from_columns(cls, wpm, raw, acc, con, ts):
+        """The same aggregates for whole columns (oldest first) at once."""
+        s = cls()
+        if not wpm:
+            return s
+        s.wpms = sorted(wpm)
+        i = max(range(len(wpm)), key=wpm.__getitem__)        # first best, as add() keeps
+        s.top  = wpm[i]
+        s.best = {"wpm": round(wpm[i], 1), "raw": round(raw[i], 1), "acc": round(acc[i], 1),
+                  "con": round(con[i], 1), "date": day_of(ts[i])}
+        days = defaultdict(lambda: [0, 0.0])
+        for t, a in zip(ts, acc):
+            d = days[t // DAY_MS]
+            d[0] += 1
+            d[1] += a
+        s.per_day.update((day_of(k * DAY_MS), v) for k, v in days.items())
+        return s
+
+    def quantile(self, q):
+        return round(self.wpms[min(len(self.wpms) - 1, int(q * len(self.wpms)))], 1)
+
+    def acc_mean(self, days, today):
+        cutoff = (today - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        tests = accs = 0
+        for day, (n, s) in self.per_day.items():
+            if day >= cutoff:
+                tests, accs = tests + n, accs + s
+        return round(accs / tests, 1) if tests else None
+
+    def summary(self, today):
+        recent = (today - timedelta(days=29)).strftime("%Y-%m-%d")
+        all_tests = sum(n for n, _ in self.per_day.values())
+        all_acc   = sum(s for _, s in self.per_day.values())
+        return {
+            "tests":   len(self.wpms),
+            "best":    self.best,
+            "median":  self.quantile(0.5),
+            "p90":     self.quantile(0.9),
+            "accTrend": {"last7":  self.acc_mean(7, today),
+                         "last30": self.acc_mean(30, today),
+                         "all":    round(all_acc / all_tests, 1) if all_tests else None},
+            "testsByDay": {d: n for d, (n, _) in sorted(self.per_day.items()) if d >= recent},
+        }
+
+
+def stored_count(path=HISTORY_PATH):
+    """How many results the history file holds, without unpacking it."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("count", 0)
+    except (OSError, ValueError):
+        return 0
+
+
+class History:
+    def __init__(self):
+        self.modes = []                       # mode id -> label
+        self.cols  = {name: array(tc) for name, (tc, _) in COLUMNS.items()}
+        self.mode  = array("H")
+        self._stats = None                    # label -> ModeStats, built on first use
+
+    def __len__(self):
+        return len(self.mode)
+
+    @classmethod
+    def load(cls, path=HISTORY_PATH):
+        h = cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            return h
+        h.modes = d["modes"]
+        h.mode  = _unpack("H", d["mode"])
+        for name, (tc, _) in COLUMNS.items():
+            h.cols[name] = _unpack(tc, d[name])
+        return h
+
+    @property
+    def stats(self):
+        if self._stats is None:
+            rows = defaultdict(list)
+            for i, m in enumerate(self.mode):
+                rows[m].append(i)
+            c = self.cols
+            self._stats = defaultdict(ModeStats)
+            for m, idx in rows.items():
+                self._stats[self.modes[m]] = ModeStats.from_columns(
+                    *([c[name][i] for i in idx] for name in ("wpm", "raw", "acc", "con", "ts")))
+        return self._stats
+
+    def save(self, path=HISTORY_PATH):
+        d = {"version": 1, "count": len(self), "modes": self.modes, "mode": _pack(self.mode)}
+        d.update({name: _pack(arr) for name, arr in self.cols.items()})
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(d, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def latest_ts(self):
+        return max(self.cols["ts"], default=0)
+
+    def add(self, results):
+        """Append results newer than anything stored (oldest first); returns how many."""
+        last  = self.latest_ts()
+        fresh = sorted((r for r in results
+                        if isinstance(r.get("timestamp"), (int, float)) and r["timestamp"] > last),
+                       key=lambda r: r["timestamp"])
+        for r in fresh:
+            label = mode_label(r)
+            if label not in self.modes:
+                self.modes.append(label)
+            self.mode.append(self.modes.index(label))
+            for name, (_, key) in COLUMNS.items():
+                v = r.get(key, r.get("wpm", 0) if key == "rawWpm" else 0)
+                self.cols[name].append(int(v) if name == "ts" else float(v or 0))
+            if self._stats is not None:
+                c = self.cols
+                self._stats[label].add(c["wpm"][-1], c["raw"][-1], c["acc"][-1], c["con"][-1],
+                                       c["ts"][-1])
+        return len(fresh)
+
+    def records(self, since_ts=None, last=None):
+        """Results as dicts (name/wpm/raw/acc/con), either since a timestamp or the last N."""
+        ts = self.cols["ts"]
+        start = bisect.bisect_left(ts, since_ts) if since_ts is not None else max(0, len(ts) - (last or len(ts)))
+        c = self.cols
+        return [{"name": self.modes[self.mode[i]], "wpm": c["wpm"][i], "rawWpm": c["raw"][i],
+                 "acc": c["acc"][i], "consistency": c["con"][i], "timestamp": ts[i]}
+                for i in range(start, len(ts))]
+
+    def aggregates(self):
+        today = datetime.now(timezone.utc)
+        return {label: self.stats[label].summary(today) for label in sorted(self.stats)}
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+pipeline.py — one scheduled pass over every dashboard job.
+
+Fetch → normalize → render is described as a DAG of stages:
+
+  fetch_mt ──┬──────────────────► data_json ─┬─► prerender  (data.json, data/shards/, index.html)
+  fetch_lc ──┼──► leetcode_json ─────────────┴─► svg_cards  (data/leetcode.json, assets/*.svg)
+  fetch_sql ─┘
+  fetch_mt ─────► readme_monkeytype ─┬─► readme   (README_PATH, one write)
+  tasks_sync ───► readme_tasks ──────┘           (data/tasks.json)
+  fetch_team ───► data_json                       (only with TEAM_ROSTER)
+
+readme_monkeytype only exists with a MONKEYTYPE_APE_KEY, tasks_sync and
+readme_tasks only with GITHUB_REPOSITORY (always set in Actions). The section
+stages are soft dependencies of readme: it runs once they have finished and
+writes whichever sections succeeded, so one failing source does not hold
+back the other.
+
+Stages run as soon as their dependencies finish, independent ones in
+parallel. Each stage hashes its inputs (timestamps stripped) and is skipped
+when the hash matches the previous run and its outputs still exist, so
+unchanged data is neither re-rendered nor re-committed. The run ends with a
+single combined change set: the output files whose bytes actually changed,
+printed and exported as `changed` to $GITHUB_OUTPUT for one commit.
+
+  python scripts/pipeline.py            # normal run
+  python scripts/pipeline.py --force    # ignore input hashes, run everything
+  python scripts/pipeline.py --plan     # expected HTTP calls vs. known budgets
+  python scripts/pipeline.py --profile  # per-phase time/memory (profiling.py)
+
+Configuration is the same environment the individual scripts read.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import fetch_data
+import mt_history
+import profiling
+import ratelimit
+import readme_sections
+import shards
+
+STATE_PATH = os.path.expanduser(
+    os.environ.get("PIPELINE_STATE", "~/.cache/dashboard/pipeline.json"))
+WORKERS    = int(os.environ.get("PIPELINE_WORKERS", "") or 4)
+
+# name, deps, run(results) -> result, inputs(results) -> hashable data | None
+# (None = always run), output files, soft deps (waited for, but a failed or
+# blocked one only hands over None)
+Stage = namedtuple("Stage", "name deps run inputs outputs soft", defaults=((),))
+
+VOLATILE = {"lastUpdated", "generatedAt", "syncedAt"}
+
+
+def strip_volatile(v):
+    if isinstance(v, dict):
+        return {k: strip_volatile(x) for k, x in v.items() if k not in VOLATILE}
+    if isinstance(v, list):
+        return [strip_volatile(x) for x in v]
+    return v
+
+
+def digest(data):
+    blob = json.dumps(strip_volatile(data), sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def file_hash(path):
+    """sha256 of a file, or of a directory's file names and contents."""
+    if os.path.isdir(path):
+        h = hashlib.sha256()
+        for name in sorted(os.listdir(path)):
+            h.update(f"{name}\0{file_hash(os.path.join(path, name))}\0".encode())
+        return h.hexdigest()
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_state():
+    try:
+        return read_json(STATE_PATH)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    with open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+# ── stages ────────────────────────────────────────────────────────────────────
+def build_stages():
+    ape_key  = os.environ.get("MONKEYTYPE_APE_KEY", "").strip()
+    gh_token = os.environ.get("GITHUB_TOKEN", "")
+    sql_repo = os.environ.get("SQL_REPO",      "LekhanaMitta/8WeekSQLChallenge")
+    lc_user  = os.environ.get("LC_USERNAME",   "LekhanaRM")
+    mt_user  = os.environ.get("MT_USERNAME",   "theUnbeknownst")
+    out_path = os.environ.get("DATA_JSON_PATH", "data.json")
+    readme_path = os.environ.get("README_PATH", "README.md")
+    # the per-script entry points read their own variable names
+    os.environ.setdefault("LEETCODE_USERNAME", lc_user)
+    os.environ.setdefault("MT_USERNAME", mt_user)
+
+    def data_json(r):
+        with profiling.phase("write"):
+            fetch_data.write_data_json(out_path, r["fetch_mt"], r["fetch_lc"], r["fetch_sql"],
+                                       r.get("fetch_team"))
+
+    def prerender(r):
+        import prerender
+        prerender.main()
+
+    def leetcode_json(r):
+        import fetch_leetcode
+        fetch_leetcode.main()
+
+    def svg_cards(r):
+        import render_svg
+        render_svg.main()
+
+    def tasks_sync(r):
+        import build_dashboard
+        return build_dashboard.sync(os.environ.get("TASK_FULL_SYNC") == "1")
+
+    def readme_tasks(r):
+        import build_dashboard
+        with profiling.phase("render"):
+            return build_dashboard.tasks_section(r["tasks_sync"])
+
+    def readme_monkeytype(r):
+        import update_monkeytype_readme
+        with profiling.phase("render"):
+            return update_monkeytype_readme.monkeytype_block()
+
+    def readme(r):
+        # section stages that were skipped as unchanged, failed or left out
+        # hand over None
+        sections = {name: r[stage] for name, stage in
+                    (("TASKS", "readme_tasks"), ("MONKEYTYPE", "readme_monkeytype"))
+                    if r.get(stage) is not None}
+        if sections:
+            with profiling.phase("write"):
+                readme_sections.update(readme_path, sections, append_missing={"TASKS"})
+
+    # roster mode (TEAM_ROSTER) adds one more source to data.json
+    team = ("fetch_team",) if fetch_data.TEAM_ROSTER else ()
+    # the Monkeytype README section needs an ApeKey for the last result, the
+    # task dashboard a repository to read issues from
+    tasks = bool(os.environ.get("GITHUB_REPOSITORY"))
+    sections = (("readme_tasks",) if tasks else ()) + (("readme_monkeytype",) if ape_key else ())
+
+    stages = [
+        Stage("fetch_mt",  (), lambda r: fetch_data.fetch_section(
+                  "monkeytype", lambda: fetch_data.fetch_monkeytype(mt_user, ape_key)), None,
+              (mt_history.HISTORY_PATH,)),
+        Stage("fetch_lc",  (), lambda r: fetch_data.fetch_section(
+                  "leetcode", lambda: fetch_data.fetch_leetcode(lc_user)), None,
+              (fetch_data.LC_CALENDAR_PATH,)),
+        Stage("fetch_sql", (), lambda r: fetch_data.fetch_section(
+                  "sql", lambda: fetch_data.fetch_sql(sql_repo, gh_token)), None, ()),
+        Stage("data_json", ("fetch_mt", "fetch_lc", "fetch_sql") + team, data_json,
+              lambda r: [r["fetch_mt"], r["fetch_lc"], r["fetch_sql"], r.get("fetch_team")],
+              (out_path, shards.SHARD_DIR)),
+        Stage("prerender", ("data_json",), prerender, None, ("index.html",)),
+        Stage("leetcode_json", ("fetch_lc",), leetcode_json,
+              lambda r: r["fetch_lc"], ("data/leetcode.json",)),
+        # svg_cards skips unchanged cards itself, per card
+        Stage("svg_cards", ("leetcode_json", "data_json"), svg_cards, None, ("assets",)),
+        Stage("readme", (), readme, None, (readme_path,), soft=sections),
+    ]
+    if tasks:
+        stages += [Stage("tasks_sync", (), tasks_sync, None, ("data/tasks.json",)),
+                   Stage("readme_tasks", ("tasks_sync",), readme_tasks,
+                         lambda r: r["tasks_sync"], ())]
+    if ape_key:
+        stages.append(Stage("readme_monkeytype", ("fetch_mt",), readme_monkeytype,
+                            lambda r: r["fetch_mt"], ()))
+    if team:
+        stages.append(Stage("fetch_team", (), lambda r: fetch_data.fetch_section(
+            "team", lambda: fetch_data.fetch_team(fetch_data.load_roster())), None, ()))
+    return stages
+
+
+# ── runner ────────────────────────────────────────────────────────────────────
+def execute(stage, results, state, force):
+    """Run one stage; returns (status, result, input hash)."""
+    h = digest(stage.inputs(results)) if stage.inputs else None
+    if (not force and h and state.get(stage.name) == h
+            and all(os.path.exists(p) for p in stage.outputs)):
+        return "unchanged", None, h
+    try:
+        return "ok", stage.run(results), h
+    except (Exception, SystemExit):
+        print(f"[{stage.name}] FAILED", file=sys.stderr)
+        traceback.print_exc()
+        return "failed", None, None
+
+
+def run(stages, force=False):
+    names = {s.name for s in stages}
+    for s in stages:
+        missing = set(s.deps + s.soft) - names
+        if missing:
+            raise ValueError(f"stage {s.name} depends on unknown {sorted(missing)}")
+
+    outputs = sorted({p for s in stages for p in s.outputs})
+    before  = {p: file_hash(p) for p in outputs}
+    state   = load_state()
+    results, status, timing = {}, {}, {}
+    pending = {s.name: s for s in stages}
+    by_name = dict(pending)
+    # a stage without output files only feeds its consumers: its input hash is
+    # kept once one of them has succeeded, or the next run would skip it as
+    # unchanged and its result would never reach them
+    consumers = {s.name: [c.name for c in stages if s.name in c.deps + c.soft]
+                 for s in stages}
+    deferred  = {}
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as ex:
+        running = {}
+        while pending or running:
+            progress = True
+            while progress:                 # a stage blocked here may unblock a soft waiter
+                progress = False
+                for name, s in list(pending.items()):
+                    if any(status.get(d) in ("failed", "blocked") for d in s.deps):
+                        status[name] = "blocked"
+                    elif (all(status.get(d) in ("ok", "unchanged") for d in s.deps)
+                          and all(d in status for d in s.soft)):
+                        t0 = time.perf_counter()
+                        running[ex.submit(execute, s, dict(results), state, force)] = (name, t0)
+                    else:
+                        continue
+                    del pending[name]
+                    progress = True
+            if not running:
+                if pending:
+                    raise ValueError(f"dependency cycle among {sorted(pending)}")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for f in done:
+                name, t0 = running.pop(f)
+                status[name], results[name], h = f.result()
+                timing[name] = time.perf_counter() - t0
+                if status[name] == "ok" and h:
+                    if by_name[name].outputs or not consumers[name]:
+                        state[name] = h
+                    else:
+                        deferred[name] = h
+                if status[name] in ("ok", "unchanged"):
+                    s = by_name[name]
+                    for d in s.deps + s.soft:
+                        if d in deferred:
+                            state[d] = deferred.pop(d)
+
+    save_state(state)
+    changed = [p for p in outputs if file_hash(p) != before[p]]
+
+    print("\n── Pipeline ─────────────────────────", flush=True)
+    for s in stages:
+        print(f"  {s.name:<18} {status[s.name]:<10} {timing.get(s.name, 0):6.2f}s")
+    print(f"  changed: {' '.join(changed) or '(nothing)'}")
+    gh_out = os.environ.get("GITHUB_OUTPUT")
+    if gh_out:
+        with open(gh_out, "a", encoding="utf-8") as f:
+            f.write(f"changed={' '.join(changed)}\n")
+    return status, changed
+
+
+def plan():
+    """Dry run: expected HTTP calls for every fetching stage, no requests made."""
+    import build_dashboard
+    rows = fetch_data.plan_calls(
+        os.environ.get("MT_USERNAME", "theUnbeknownst"),
+        os.environ.get("MONKEYTYPE_APE_KEY", "").strip(),
+        os.environ.get("LC_USERNAME", "LekhanaRM"),
+        os.environ.get("SQL_REPO", "LekhanaMitta/8WeekSQLChallenge"),
+        os.environ.get("GITHUB_TOKEN", ""),
+        os.environ.get("DATA_JSON_PATH", "data.json"))
+    rows += build_dashboard.plan_calls(os.environ.get("TASK_FULL_SYNC") == "1")
+    return ratelimit.report(rows)
+
+
+def main():
+    if "--plan" in sys.argv[1:]:
+        return 0 if plan() else 1
+    status, _ = run(build_stages(), force="--force" in sys.argv[1:])
+    return 1 if "failed" in status.values() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(profiling.run(main))
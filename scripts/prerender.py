@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+prerender.py — bake the data cards into index.html at build time.
+
+index.html used to show "fetching" placeholders until data.json arrived and
+renderMT / renderLC / renderLCExtra / renderSQL ran. This renders the same
+markup from data.json in Python and writes it between the card markers
+
+  <!-- MT_CARD:START --> ... <!-- MT_CARD:END -->      (also LC_CARD,
+                                                       LC_EXTRA_CARD, SQL_CARD)
+
+plus a <meta name="prerendered"> with data.json's generatedAt. On load the
+page only attaches the interactive bits (PB tabs, donut hover) and re-renders
+a card only if the data it fetches is newer than what was baked in.
+
+The templates below mirror the JS ones; keep them in step when either changes.
+
+  python scripts/prerender.py          # data.json -> index.html
+"""
+
+import json
+import math
+import os
+import time
+from html import escape
+
+import profiling
+import readme_sections
+
+DATA_PATH  = os.environ.get("DATA_JSON_PATH", "data.json")
+INDEX_PATH = os.environ.get("INDEX_PATH", "index.html")
+
+
+def js_str(v):
+    """A number the way a JS template literal prints it (98.0 -> 98)."""
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return escape(str(v))
+
+
+def js_round(v):
+    return math.floor(v + 0.5)
+
+
+# ── cards ─────────────────────────────────────────────────────────────────────
+def render_mt(d):
+    if not d:
+        return '<div class="err">No data — run the Action.</div>'
+    pbs = d.get("personalBests") or {}
+    pills = "".join(f'<button class="tab{" on" if i == 0 else ""}" data-k="{escape(k)}">{escape(k)}</button>'
+                    for i, k in enumerate(pbs))
+    cards = "".join(f"""
+      <div class="pb-card" data-k="{escape(k)}"{" hidden" if i else ""}>
+        <div class="pb-mode">{escape(k)}</div>
+        <div class="pb-val">{js_str(p["wpm"])}<small style="font-size:12px;color:var(--muted)"> wpm</small></div>
+        <div class="pb-stats" style="margin-top:6px;">
+          <div><div class="pb-sub">RAW <b>{js_str(p["raw"])}</b></div></div>
+          <div><div class="pb-sub">ACC <b>{js_str(p["acc"])}%</b></div></div>
+          <div><div class="pb-sub">CON <b>{js_str(p["con"])}%</b></div></div>
+        </div>
+      </div>""" for i, (k, p) in enumerate(pbs.items()))
+    return f"""
+    <div class="srow">
+      <div class="stat"><div class="sv cg">{js_str(d.get("streak"))}</div><div class="sl">Streak</div></div>
+      <div class="stat"><div class="sv cm">{js_str(d.get("maxStreak"))}</div><div class="sl">Best Streak</div></div>
+      <div class="stat"><div class="sv cb">{d.get("completedTests") or 0:,}</div><div class="sl">Tests</div></div>
+      <div class="stat"><div class="sv cp">{js_str(d.get("hoursTyped"))}h</div><div class="sl">Typed</div></div>
+    </div>
+    <div class="divider"></div>
+    <div class="section-lbl">Personal Bests</div>
+    <div class="tabs" id="mt-tabs">{pills}</div>
+    <div class="pb-grid" id="pb-grid">{cards}
+    </div>"""
+
+
+def calendar_dots(calendar30, now):
+    """The 30 dots renderLC draws, as of `now` (epoch seconds)."""
+    dots = []
+    for i in range(29, -1, -1):
+        ts = now - i * 86400 - now % 86400
+        cnt = next((v for k, v in calendar30.items() if abs(int(k) - ts) < 86400), 0)
+        cls = "" if cnt == 0 else "d1" if cnt == 1 else "d2" if cnt <= 3 else "d3" if cnt <= 6 else "d4"
+        dots.append(f'<div class="cal-dot{" " + cls if cls else ""}" title="{cnt} submissions"></div>')
+    return "".join(dots)
+
+
+def render_lc(d, now=None):
+    if not d:
+        return """<div style="text-align:center;padding:28px;">
+      <div style="font-size:28px;opacity:.4">⏳</div>
+      <div class="loading" style="padding-top:8px;">Run Actions → Refresh Dashboard Data</div></div>"""
+    slices = [
+        {"label": "Easy",   "val": d.get("easy", 0),   "tot": d.get("totalEasy", 0),
+         "beats": d.get("beatsEasy", 0),   "color": "var(--blue)"},
+        {"label": "Medium", "val": d.get("medium", 0), "tot": d.get("totalMedium", 0),
+         "beats": d.get("beatsMedium", 0), "color": "var(--orange)"},
+        {"label": "Hard",   "val": d.get("hard", 0),   "tot": d.get("totalHard", 0),
+         "beats": d.get("beatsHard", 0),   "color": "var(--red)"},
+    ]
+    rows = "".join(f"""
+          <div class="lc-row">
+            <span class="ldot" style="background:{s["color"]}"></span>
+            <span class="lname">{s["label"]}</span>
+            <span class="lpct">{js_round(s["val"] / s["tot"] * 100) if s["tot"] else 0}%</span>
+            <span class="lnum" style="color:{s["color"]}">{s["val"]}</span>
+          </div>
+          <div style="padding-left:16px;margin-top:-4px;margin-bottom:2px;">
+            <span class="lbeats">beats {js_str(s["beats"])}% users</span>
+          </div>""" for s in slices)
+    cal = d.get("calendar30") or {}
+    cal_html = f"""
+    <div class="divider"></div>
+    <div class="section-lbl">30-day activity</div>
+    <div class="cal-wrap" id="lcCal">{calendar_dots(cal, int(now or time.time()))}</div>""" if cal else ""
+    return f"""
+    <div class="srow" style="margin-bottom:14px;">
+      <div class="stat"><div class="sv cb">{d.get("easy", 0)}</div><div class="sl">Easy</div></div>
+      <div class="stat"><div class="sv co">{d.get("medium", 0)}</div><div class="sl">Medium</div></div>
+      <div class="stat"><div class="sv cr">{d.get("hard", 0)}</div><div class="sl">Hard</div></div>
+    </div>
+    <div class="divider"></div>
+    <div class="lc-ring-wrap">
+      <div class="ring-outer">
+        <canvas id="lcCanvas" width="120" height="120" data-slices="{escape(json.dumps(slices))}"></canvas>
+        <div class="ring-mid"><span class="ring-num">{d.get("total", 0)}</span><span class="ring-sub">solved</span></div>
+      </div>
+      <div class="lc-rows">{rows}
+        <div class="lc-meta" style="margin-top:6px;">
+          <span>🔥 Streak <b>{d.get("streak", 0)}</b></span>
+          <span>📅 Active <b>{d.get("totalActiveDays", 0)}</b> days</span>
+          <span>🏆 Rank <b>{d.get("ranking") or 0:,}</b></span>
+        </div>
+      </div>
+    </div>{cal_html}"""
+
+
+def render_lc_extra(d):
+    """The whole skills/languages card (hidden when there is no LeetCode data)."""
+    body = ""
+    if d:
+        langs  = d.get("languages") or []
+        max_l  = (langs[0]["solved"] if langs else 0) or 1
+        lang_rows = "".join(f"""
+            <div class="lang-row">
+              <span class="lang-name">{escape(l["lang"])}</span>
+              <div class="lang-bar"><div class="lang-fill" style="width:{js_round(l["solved"] / max_l * 100)}%"></div></div>
+              <span class="lang-count">{l["solved"]}</span>
+            </div>""" for l in langs)
+        pills = "".join(f"""
+            <span class="skill-pill {escape(s["tier"])}">{escape(s["tag"])} <span class="skill-num">{s["solved"]}</span></span>"""
+                        for s in d.get("topSkills") or [])
+        body = f"""
+    <div style="display:grid;grid-template-columns:1fr 1fr;gap:20px;flex-wrap:wrap;">
+      <div>
+        <div class="section-lbl">Top Languages</div>
+        <div class="lang-list">{lang_rows}
+        </div>
+      </div>
+      <div>
+        <div class="section-lbl">Top Skills</div>
+        <div class="skill-grid">{pills}
+        </div>
+      </div>
+    </div>"""
+    user = escape((d or {}).get("username") or "LekhanaRM")
+    return f"""    <div class="card leetcode span2" id="lc-extra-card"{"" if d else ' style="display:none;"'}>
+      <div class="card-head">
+        <div class="ctg"><span class="cicon">📊</span><span class="ctitle">LeetCode · Skills & Languages</span></div>
+        <a class="clink" href="https://leetcode.com/{user}" target="_blank" rel="noopener">{user} ↗</a>
+      </div>
+      <div class="cbody" id="lc-extra">{body}</div>
+    </div>
+    """
+
+
+def render_sql(d):
+    if not d:
+        return '<div class="err">Could not load.</div>'
+    weeks = d.get("weeks") or []
+    done  = sum(1 for w in weeks if w.get("done"))
+    rows = []
+    for w in weeks:
+        commits = w.get("commits") or 0
+        pct = 100 if w.get("done") else 50 if commits > 0 else 0
+        cls = "done" if w.get("done") else "wip" if commits > 0 else "todo"
+        lbl = "✓ done" if w.get("done") else f"{commits} commits" if commits > 0 else "–"
+        rows.append(f"""<div class="week-row">
+        <span class="wlbl">Week {w["n"]}</span>
+        <div class="wbar"><div class="wfill" style="width:{pct}%"></div></div>
+        <span class="wstat {cls}">{lbl}</span>
+      </div>""")
+    return f"""
+    <div class="srow" style="margin-bottom:14px;">
+      <div class="stat"><div class="sv cgr">{done}</div><div class="sl">Done</div></div>
+      <div class="stat"><div class="sv cm">{8 - done}</div><div class="sl">Left</div></div>
+      <div class="stat"><div class="sv cp">{js_round(done / 8 * 100)}%</div><div class="sl">Progress</div></div>
+    </div>
+    <div class="divider"></div>
+    {"".join(rows)}
+    <div style="font-family:var(--mono);font-size:12px;color:var(--muted);margin-top:10px;"><b style="color:var(--green)">{done}</b> of 8 case studies completed</div>"""
+
+
+def sections(data, now=None):
+    """{marker name: html} for every pre-rendered part of index.html."""
+    lc = data.get("leetcode")
+    return {
+        "PRERENDER":     f'<meta name="prerendered" content="{escape(data.get("generatedAt") or "")}"/>',
+        "MT_CARD":       render_mt(data.get("monkeytype")),
+        "LC_CARD":       render_lc(lc, now),
+        "LC_EXTRA_CARD": render_lc_extra(lc),
+        "SQL_CARD":      render_sql(data.get("sql")),
+    }
+
+
+def main():
+    with profiling.phase("parse"), open(DATA_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    with profiling.phase("render"):
+        html = sections(data)
+    with profiling.phase("write"):
+        changed = readme_sections.update(INDEX_PATH, html)
+    print(f"{'Pre-rendered' if changed else 'Unchanged'}: {INDEX_PATH} from {DATA_PATH}")
+
+
+if __name__ == "__main__":
+    profiling.run(main)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+profiling.py — per-phase time and memory profile of one entry point.
+
+  python scripts/fetch_data.py --profile          (or PROFILE=1)
+
+times the fetch / parse / aggregate / render / write phases of the run,
+traces allocations with tracemalloc, and on exit prints a summary and
+writes into PROFILE_DIR:
+
+  <script>.phases.json   per phase: calls, wall seconds (total and
+                         excluding nested phases), thread CPU seconds and
+                         net allocated bytes; plus peak traced memory and
+                         the allocation sites still holding the most at exit
+  <script>.pstats        with PROFILE_CPROFILE=1 (snakeviz / pstats; covers
+                         the main thread — FETCH_CONCURRENCY=1 puts all of
+                         fetch_data's work there)
+  <script>.folded        with PROFILE_SAMPLE_MS=N, every thread's stack
+                         sampled each N ms, in the collapsed format
+                         flamegraph.pl and speedscope read
+
+Phases nest (a "fetch" inside an "aggregate" is charged to fetch, not
+twice) and are kept per thread. When profiling is off, phase() hands back
+one shared no-op context manager and run() just calls main.
+
+  PROFILE_DIR        output directory     (default ~/.cache/dashboard/profile)
+  PROFILE_TOP        allocation sites to keep                          (15)
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+ENABLED   = "--profile" in sys.argv[1:] or os.environ.get("PROFILE") == "1"
+OUT_DIR   = os.path.expanduser(os.environ.get("PROFILE_DIR", "~/.cache/dashboard/profile"))
+CPROFILE  = os.environ.get("PROFILE_CPROFILE") == "1"
+SAMPLE_MS = float(os.environ.get("PROFILE_SAMPLE_MS", "") or 0)
+TOP       = int(os.environ.get("PROFILE_TOP", "") or 15)
+
+_NULL   = contextlib.nullcontext()
+_local  = threading.local()
+_lock   = threading.Lock()
+_phases = defaultdict(lambda: {"calls": 0, "wall": 0.0, "self": 0.0, "cpu": 0.0, "alloc": 0})
+
+
+class _Phase:
+    __slots__ = ("name", "t0", "cpu0", "mem0", "nested")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        import tracemalloc
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.nested = 0.0
+        self.mem0 = tracemalloc.get_traced_memory()[0]
+        self.cpu0 = time.thread_time()
+        self.t0   = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        import tracemalloc
+        wall = time.perf_counter() - self.t0
+        cpu  = time.thread_time() - self.cpu0
+        mem  = tracemalloc.get_traced_memory()[0] - self.mem0
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].nested += wall
+        with _lock:
+            p = _phases[self.name]
+            p["calls"] += 1
+            p["wall"]  += wall
+            p["self"]  += wall - self.nested
+            p["cpu"]   += cpu
+            p["alloc"] += mem
+        return False
+
+
+def phase(name):
+    """Context manager timing one phase; a shared no-op when profiling is off."""
+    if not ENABLED:
+        return _NULL
+    return _Phase(name)
+
+
+# ── stack sampler ─────────────────────────────────────────────────────────────
+class Sampler(threading.Thread):
+    def __init__(self, interval):
+        super().__init__(name="profiling-sampler", daemon=True)
+        self.interval = interval
+        self.stacks   = Counter()
+        self.stopped  = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                frames.append(names.get(ident, "thread"))
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def folded(self):
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+# ── run wrapper ───────────────────────────────────────────────────────────────
+def _script():
+    return os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+
+
+def report(started, profiler=None, sampler=None):
+    """Print the phase table and write the profile files."""
+    import tracemalloc
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    sites = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__))).statistics("lineno")[:TOP]
+    tracemalloc.stop()
+
+    script = _script()
+    os.makedirs(OUT_DIR, exist_ok=True)
+    with _lock:
+        phases = {k: dict(v) for k, v in _phases.items()}
+    out = {
+        "script": script,
+        "wallSeconds": round(wall, 4),
+        "peakTracedBytes": peak,
+        "phases": {k: {**v, "wall": round(v["wall"], 4), "self": round(v["self"], 4),
+                       "cpu": round(v["cpu"], 4)} for k, v in phases.items()},
+        "topAllocations": [{"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+                            "bytes": s.size, "count": s.count} for s in sites],
+    }
+    with open(os.path.join(OUT_DIR, f"{script}.phases.json"), "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=2)
+
+    print(f"\n── Profile: {script} ({wall:.2f}s wall, peak {peak / 1e6:.1f} MB traced) ──",
+          file=sys.stderr)
+    print(f"  {'phase':<11} {'calls':>6} {'wall s':>8} {'self s':>8} {'cpu s':>8} {'alloc MB':>9}",
+          file=sys.stderr)
+    for name, p in sorted(phases.items(), key=lambda kv: -kv[1]["self"]):
+        print(f"  {name:<11} {p['calls']:>6} {p['wall']:>8.3f} {p['self']:>8.3f} "
+              f"{p['cpu']:>8.3f} {p['alloc'] / 1e6:>9.2f}", file=sys.stderr)
+    for s in sites[:5]:
+        print(f"  alloc {s.size / 1e6:7.2f} MB  {s.traceback[0].filename}:{s.traceback[0].lineno}",
+              file=sys.stderr)
+
+    if profiler is not None:
+        profiler.dump_stats(os.path.join(OUT_DIR, f"{script}.pstats"))
+    if sampler is not None:
+        sampler.stopped.set()
+        sampler.join()
+        with open(os.path.join(OUT_DIR, f"{script}.folded"), "w", encoding="utf-8") as f:
+            f.write(sampler.folded())
+    print(f"  written to {OUT_DIR}/{script}.*", file=sys.stderr)
+
+
+def run(main):
+    """Call main(), profiled when --profile / PROFILE=1 is given; returns its result."""
+    if not ENABLED:
+        return main()
+    import tracemalloc                  # only paid for when profiling
+    tracemalloc.start()
+    sampler = Sampler(SAMPLE_MS / 1000) if SAMPLE_MS > 0 else None
+    if sampler is not None:
+        sampler.start()
+    profiler = None
+    if CPROFILE:
+        import cProfile
+        profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        return main()
+    finally:                            # also reached through sys.exit()
+        if profiler is not None:
+            profiler.disable()
+        report(started, profiler, sampler)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+ratelimit.py — per-resource, per-token request budgets for http_client.
+
+Every response's X-RateLimit-Remaining / X-RateLimit-Reset / Retry-After
+headers update the budget for (resource, auth scope). A resource is
+"host/X-RateLimit-Resource" when the host names one (GitHub: core,
+graphql, search, ... each with its own limit) and just the host otherwise.
+Which resource a path draws from is learned from the responses, per host
+and first path segment. Before a request goes
+out, acquire() waits out a Retry-After block and, once the budget runs low,
+spaces the remaining calls evenly until the reset instead of burning them
+all at once. 429s, rate-limit 403s and 502/503/504 are retried with
+jittered exponential backoff (or exactly as long as the server asked).
+
+  RATE_RETRIES     retries per request            (default 3)
+  RATE_BACKOFF     first backoff step, seconds    (default 2)
+  RATE_MAX_WAIT    longest single wait, seconds   (default 120) — a request
+                   that would have to wait longer fails instead
+  RATE_RESERVE     fraction of the limit below which calls are paced
+                   (default 0.1)
+
+Budgets are saved on exit next to the HTTP cache (RATE_STATE), so a dry-run
+plan can compare what a run will need against what is left.
+"""
+
+import atexit
+import email.utils
+import json
+import os
+import random
+import threading
+import time
+
+import http_cache
+
+RETRIES  = int(os.environ.get("RATE_RETRIES", "") or 3)
+BACKOFF  = float(os.environ.get("RATE_BACKOFF", "") or 2)
+MAX_WAIT = float(os.environ.get("RATE_MAX_WAIT", "") or 120)
+RESERVE  = float(os.environ.get("RATE_RESERVE", "") or 0.1)
+STATE_PATH = os.path.expanduser(
+    os.environ.get("RATE_STATE", "~/.cache/dashboard/ratelimit.json"))
+
+RETRY_STATUS = {429, 502, 503, 504}
+
+
+class RateLimited(Exception):
+    pass
+
+
+class Budget:
+    def __init__(self):
+        self.limit     = None
+        self.remaining = None
+        self.reset     = 0.0      # epoch seconds
+        self.blocked   = 0.0      # no requests before this (Retry-After)
+        self.next_slot = 0.0      # pacing: earliest time for the next request
+        self.calls     = 0
+        self.lock      = threading.Lock()
+
+    def as_dict(self):
+        return {"limit": self.limit, "remaining": self.remaining,
+                "reset": self.reset, "calls": self.calls}
+
+
+_budgets = {}
+_budgets_lock = threading.Lock()
+_save_registered = False
+_resources = {}           # (host, first path segment) -> X-RateLimit-Resource
+
+
+def _route(path):
+    return (path or "/").split("?", 1)[0].strip("/").split("/", 1)[0]
+
+
+def resource(host, path=None):
+    """Budget name for a request to host/path: "host/<resource>" once the
+    host has said which resource that path counts against, else the host."""
+    name = _resources.get((host, _route(path)))
+    return f"{host}/{name}" if name else host
+
+
+def budget(name, headers=None):
+    global _save_registered
+    key = f"{name} {http_cache.auth_scope(headers)}"
+    with _budgets_lock:
+        if not _save_registered:
+            atexit.register(save_state)
+            _save_registered = True
+        return _budgets.setdefault(key, Budget())
+
+
+def _sleep(seconds, why):
+    if seconds > MAX_WAIT:
+        raise RateLimited(f"{why}: would have to wait {seconds:.0f}s (RATE_MAX_WAIT={MAX_WAIT:.0f})")
+    if seconds > 0:
+        print(f"[ratelimit] {why}: waiting {seconds:.1f}s", flush=True)
+        time.sleep(seconds)
+
+
+def acquire(host, headers=None, path=None):
+    """Block until a request to host/path (with these credentials) fits the budget."""
+    b = budget(resource(host, path), headers)
+    with b.lock:
+        now = time.time()
+        wait, why = b.blocked - now, f"{host} asked to retry later"
+        if b.remaining is not None and b.reset > now:
+            if b.remaining <= 0:
+                wait, why = max(wait, b.reset - now), f"{host} budget exhausted"
+            elif b.limit and b.remaining < b.limit * RESERVE:
+                # hand out evenly spaced slots over the rest of the window
+                slot = max(b.next_slot, now)
+                b.next_slot = slot + (b.reset - now) / b.remaining
+                wait, why = max(wait, slot - now), f"{host} budget low"
+        b.calls += 1
+        if b.remaining:
+            b.remaining -= 1
+    _sleep(wait, why)
+
+
+def _header(headers, name):
+    return headers.get(name) if headers is not None else None
+
+
+def _epoch(value):
+    """X-RateLimit-Reset as epoch seconds (GitHub: epoch s; some APIs: ms or a delta)."""
+    v = float(value)
+    if v > 1e12:
+        return v / 1000
+    if v < 1e9:
+        return time.time() + v
+    return v
+
+
+def retry_after(headers):
+    value = _header(headers, "Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value)
+        return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+
+
+def record(host, headers, status, resp_headers, attempt, path=None):
+    """Update the budget from a response; returns seconds to wait before
+    retrying it, or None when the response should be returned as is."""
+    name = _header(resp_headers, "X-RateLimit-Resource")
+    if name:
+        _resources[(host, _route(path))] = name
+    b = budget(resource(host, path), headers)
+    with b.lock:
+        try:
+            if _header(resp_headers, "X-RateLimit-Limit"):
+                b.limit = int(_header(resp_headers, "X-RateLimit-Limit"))
+            if _header(resp_headers, "X-RateLimit-Remaining"):
+                b.remaining = int(_header(resp_headers, "X-RateLimit-Remaining"))
+            if _header(resp_headers, "X-RateLimit-Reset"):
+                b.reset = _epoch(_header(resp_headers, "X-RateLimit-Reset"))
+        except ValueError:
+            pass
+        after = retry_after(resp_headers)
+        if after is not None:
+            b.blocked = time.time() + after
+
+    limited = status in RETRY_STATUS or (
+        status == 403 and (after is not None or b.remaining == 0))
+    if not limited or attempt >= RETRIES:
+        return None
+    if after is not None:
+        delay = after
+    elif b.remaining == 0 and b.reset > time.time():
+        delay = b.reset - time.time()
+    else:
+        delay = BACKOFF * 2 ** attempt
+    return delay + random.uniform(0, min(delay, BACKOFF) / 2)
+
+
+def wait_retry(host, delay, status):
+    _sleep(delay, f"{host} answered {status}")
+
+
+def snapshot():
+    """{"resource scope": {limit, remaining, reset, calls}} for this process."""
+    with _budgets_lock:
+        return {k: b.as_dict() for k, b in _budgets.items()}
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state():
+    """Merge this run's budgets into RATE_STATE (for --plan)."""
+    state = load_state()
+    state.update({k: v for k, v in snapshot().items() if v["remaining"] is not None})
+    try:
+        os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+        tmp = STATE_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp, STATE_PATH)
+    except OSError:
+        pass
+
+
+def known_budget(name, headers=None):
+    """Last saved budget for a resource/credentials, if its window has not reset yet."""
+    b = load_state().get(f"{name} {http_cache.auth_scope(headers)}")
+    if b and b.get("reset", 0) > time.time():
+        return b
+    return None
+
+
+def report(rows):
+    """Print a dry-run plan: rows of (source, resource, headers, min calls,
+    max calls, note), resource as resource() names it ("api.github.com/graphql",
+    or a bare host); max None = no upper bound known.
+
+    Returns False when some resource's saved budget cannot cover the worst
+    case, or cannot be shown to because a row is unbounded.
+    """
+    print("── Plan (expected HTTP calls) ──────", flush=True)
+    for source, host, _, lo, hi, note in rows:
+        calls = f"{lo}+" if hi is None else f"{lo}" if lo == hi else f"{lo}-{hi}"
+        print(f"  {source:<12} {host:<26} {calls:>6}  {note}")
+    fits, seen = True, set()
+    for _, host, headers, _, _, _ in rows:
+        key = (host, http_cache.auth_scope(headers))
+        if key in seen:
+            continue
+        seen.add(key)
+        highs = [r[4] for r in rows if (r[1], http_cache.auth_scope(r[2])) == key]
+        need = None if None in highs else sum(highs)
+        worst = "unbounded" if need is None else f"{need} call(s)"
+        b = known_budget(host, headers)
+        if b is None:
+            print(f"  budget {host}: unknown (no saved window), worst case {worst}")
+            continue
+        left = b["remaining"]
+        ok = need is not None and left >= need
+        fits &= ok
+        mins = max(0, (b["reset"] - time.time()) / 60)
+        verdict = "ok" if ok else "UNBOUNDED" if need is None else "OVER BUDGET"
+        print(f"  budget {host}: {left}/{b['limit']} left, resets in {mins:.0f} min, "
+              f"worst case {worst} — {verdict}")
+    return fits
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+readme_sections.py — one read-modify-write of README.md for every producer.
+
+README.md is split once into literal text and marker-delimited sections
+
+  <!-- NAME:START -->
+  ...generated content...
+  <!-- NAME:END -->
+
+Producers (TASKS, MONKEYTYPE, anything added later) hand over new section
+bodies; update() applies all of them in a single read → modify → write and
+replaces the file with an atomic rename only when the bytes actually change.
+(prerender.py uses the same machinery for index.html.)
+
+There is no lock: separate workflow jobs run on separate runners, so a
+file lock could not keep them apart anyway. Within a run, pipeline.py
+writes the README once with every section. Across jobs, git does the
+merging: each workflow's push step rebases onto whatever landed meanwhile
+and retries, and edits to different sections rebase cleanly.
+"""
+
+import os
+import re
+import tempfile
+
+SECTION = re.compile(r"<!-- ([A-Z0-9_]+):START -->(.*?)<!-- \1:END -->", re.DOTALL)
+
+
+def markers(name):
+    return f"<!-- {name}:START -->", f"<!-- {name}:END -->"
+
+
+class ReadmeSections:
+    """README text as a list of literal strings and [name, body] sections."""
+
+    def __init__(self, text):
+        self.parts, pos = [], 0
+        for m in SECTION.finditer(text):
+            self.parts.append(text[pos:m.start()])
+            self.parts.append([m.group(1), m.group(2)])
+            pos = m.end()
+        self.parts.append(text[pos:])
+
+    def set(self, name, content, append_missing=False):
+        body = "\n" + content.strip("\n") + "\n"
+        for p in self.parts:
+            if isinstance(p, list) and p[0] == name:
+                p[1] = body
+                return
+        if not append_missing:
+            raise KeyError(f"{name} markers not found in README")
+        self.parts[-1] = self.parts[-1].rstrip() + "\n\n"
+        self.parts += [[name, body], "\n"]
+
+    def render(self):
+        out = []
+        for p in self.parts:
+            if isinstance(p, list):
+                start, end = markers(p[0])
+                out += [start, p[1], end]
+            else:
+                out.append(p)
+        return "".join(out)
+
+
+def update(path, sections, append_missing=()):
+    """Apply {name: content} to the README at path; returns True if it was rewritten.
+
+    Sections named in append_missing are added at the end when their markers
+    are missing; any other missing section raises KeyError.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    doc = ReadmeSections(text)
+    for name, content in sections.items():
+        doc.set(name, content, append_missing=name in append_missing)
+    new = doc.render()
+    if new == text:
+        return False
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(new)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+    return True
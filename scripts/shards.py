@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+shards.py — content-hashed, precompressed per-section copies of data.json.
+
+index.html used to fetch the whole data.json with a cache-busting query on
+every view. Each section (monkeytype, leetcode, sql) is also written as
+
+  data/shards/<section>.<hash>.json   (+ .json.gz, and .json.br with brotli)
+
+where <hash> covers the section's content. A section that did not change
+keeps its filename, so browsers and the CDN can cache shards forever and a
+page view only downloads what changed. data/shards/manifest.json is the one
+small file that has to be revalidated:
+
+  {"generatedAt": ..., "sections": {"leetcode": {"file": "leetcode.<hash>.json",
+                                                 "lastUpdated": ..., "bytes": N}}}
+
+lastUpdated moves to the manifest (it changes every run and would otherwise
+give every shard a new name). Shards from before the previous manifest are
+removed, so pages still holding the old manifest keep working for one run.
+
+  SHARD_DIR   where shards are written   (default data/shards)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli                       # optional: .br variants
+except ImportError:
+    brotli = None
+
+SHARD_DIR = os.environ.get("SHARD_DIR", "data/shards")
+MANIFEST  = "manifest.json"
+VOLATILE  = ("lastUpdated",)
+
+
+def _write(path, blob):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+
+
+def _manifest_files(manifest):
+    return {s["file"] for s in (manifest.get("sections") or {}).values()}
+
+
+def write_shards(payload, shard_dir=SHARD_DIR):
+    """Write one shard per section of payload plus the manifest; returns the manifest."""
+    os.makedirs(shard_dir, exist_ok=True)
+    manifest_path = os.path.join(shard_dir, MANIFEST)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    sections = {}
+    for name, data in payload.items():
+        if not isinstance(data, dict):
+            continue
+        body = {k: v for k, v in data.items() if k not in VOLATILE}
+        blob = json.dumps(body, separators=(",", ":"), sort_keys=True).encode()
+        fname = f"{name}.{hashlib.sha256(blob).hexdigest()[:12]}.json"
+        path  = os.path.join(shard_dir, fname)
+        if not os.path.exists(path):
+            _write(path, blob)
+            # mtime=0 keeps the .gz bytes identical across runs
+            _write(path + ".gz", gzip.compress(blob, 9, mtime=0))
+            if brotli is not None:
+                _write(path + ".br", brotli.compress(blob, quality=11))
+        sections[name] = {"file": fname, "lastUpdated": data.get("lastUpdated"),
+                          "bytes": len(blob)}
+
+    manifest = {"generatedAt": payload.get("generatedAt"), "sections": sections}
+    _write(manifest_path, json.dumps(manifest, indent=2).encode())
+
+    keep = _manifest_files(manifest) | _manifest_files(previous)
+    for n in os.listdir(shard_dir):
+        base = n.split(".json")[0] + ".json"
+        if n != MANIFEST and base not in keep and not n.endswith(".tmp"):
+            os.remove(os.path.join(shard_dir, n))
+    return manifest
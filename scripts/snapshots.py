@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+snapshots.py — per-provider snapshots of normalized API responses, with a TTL.
+
+Several scripts need the same upstream data (fetch_data.py and
+update_monkeytype_readme.py both read Monkeytype; fetch_data.py and
+fetch_leetcode.py both read LeetCode). Whichever runs first stores what it
+fetched here; the others reuse it while it is fresh instead of calling the
+API again, which also keeps the README, the SVG and data.json in agreement.
+
+The primary fetch (fetch_data.py) always fetches and then writes the
+snapshot (cached(..., refresh=True)); only the secondary consumers read one.
+The TTL only has to cover the scripts of one run, so it is kept well below
+the 3-hourly schedule: a scheduled run never picks up the previous run's data.
+
+  SNAPSHOT_DIR   where snapshots live  (default ~/.cache/dashboard/snapshots)
+  SNAPSHOT_TTL   freshness window      (default 15 minutes, in seconds)
+  SNAPSHOT=0     always fetch (snapshots are still written)
+
+Like the HTTP cache, the directory sits outside the checkout and is carried
+between workflow runs by actions/cache.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+SNAPSHOT_DIR = os.path.expanduser(
+    os.environ.get("SNAPSHOT_DIR", "~/.cache/dashboard/snapshots"))
+SNAPSHOT_TTL = int(os.environ.get("SNAPSHOT_TTL", "") or 15 * 60)
+ENABLED      = os.environ.get("SNAPSHOT", "1") != "0"
+
+
+def _path(provider, key):
+    digest = hashlib.sha256(str(key).lower().encode()).hexdigest()[:12]
+    return os.path.join(SNAPSHOT_DIR, f"{provider}-{digest}.json")
+
+
+def load(provider, key, ttl=SNAPSHOT_TTL):
+    """Snapshot data if one exists and is younger than ttl seconds, else None."""
+    try:
+        with open(_path(provider, key), "r", encoding="utf-8") as f:
+            snap = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - snap.get("fetchedAt", 0) > ttl:
+        return None
+    return snap["data"]
+
+
+def save(provider, key, data):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"provider": provider, "key": key,
+                   "fetchedAt": time.time(), "data": data}, f)
+    os.replace(tmp, _path(provider, key))
+
+
+def cached(provider, key, fetch, ok=bool, ttl=SNAPSHOT_TTL, refresh=False):
+    """Fresh snapshot for (provider, key), or fetch() and store it.
+
+    refresh=True skips the lookup and always fetches. Results for which
+    ok(data) is false (a failed or partial fetch) are returned but not
+    stored, so one bad run cannot pin bad data for a TTL.
+    """
+    if ENABLED and not refresh:
+        data = load(provider, key, ttl)
+        if data is not None:
+            print(f"[snapshot] {provider}/{key}: reusing fresh snapshot", flush=True)
+            return data
+    data = fetch()
+    if data is not None and ok(data):
+        save(provider, key, data)
+    return data
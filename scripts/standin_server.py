@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+standin_server.py — a local HTTP server standing in for every upstream API.
+
+Point the scripts at it with HTTP_BASE_OVERRIDE; http_client then sends each
+request here with the real host in an X-Original-Host header, and a
+responder decides the answer:
+
+  python scripts/standin_server.py cassettes/live.json --port 8765 \\
+      --latency 80 --jitter 40 --error-rate 0.05 --error-status 503
+
+Options (each also readable from the environment, STANDIN_<NAME>):
+  --latency MS      added to every response                        (0)
+  --jitter MS       plus a uniform random 0..MS                    (0)
+  --error-rate P    fraction of requests answered with an error    (0)
+  --error-status N  status code for injected errors                (503)
+  --retry-after S   Retry-After header on injected errors          (none)
+  --seed N          make latency/error injection reproducible
+
+A responder is any callable (method, host, path, body, headers) ->
+(status, headers, body bytes) or None for a 404; CassetteResponder replays a
+recorded cassette. bench.py plugs in a synthetic one. GETs get an ETag, and a
+matching If-None-Match is answered with 304 like the real APIs do.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cassette import Cassette
+
+
+class CassetteResponder:
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+    def __call__(self, method, host, path, body, headers):
+        return self.cassette.next(method, host, path, body)
+
+
+class Faults:
+    """Latency and error injection shared by all handler threads."""
+
+    def __init__(self, latency=0, jitter=0, error_rate=0.0, error_status=503,
+                 retry_after=None, seed=None):
+        self.latency, self.jitter = latency / 1000, jitter / 1000
+        self.error_rate, self.error_status = error_rate, error_status
+        self.retry_after = retry_after
+        self._rng  = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        with self._lock:
+            extra = self._rng.uniform(0, self.jitter) if self.jitter else 0
+            failed = self.error_rate and self._rng.random() < self.error_rate
+        return self.latency + extra, failed
+
+
+def make_handler(responder, faults, stats):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"          # keep-alive, like the real APIs
+
+        def _answer(self, method):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else None
+            host = self.headers.get("X-Original-Host") or self.headers.get("Host", "")
+            wait, failed = faults.delay()
+            if wait:
+                time.sleep(wait)
+            with stats["lock"]:
+                stats["requests"] += 1
+            if failed:
+                extra = {"Retry-After": str(faults.retry_after)} if faults.retry_after is not None else {}
+                return self._send(faults.error_status, extra, b'{"message":"injected error"}')
+            got = responder(method, host, self.path, body, self.headers)
+            if got is None:
+                return self._send(404, {}, b'{"message":"not in cassette"}')
+            status, headers, payload = got
+            if method == "GET" and status == 200:
+                etag = headers.get("ETag") or '"%s"' % hashlib.sha256(payload).hexdigest()[:16]
+                headers = {**headers, "ETag": etag}
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, headers, b"")
+            self._send(status, headers, payload)
+
+        def _send(self, status, headers, payload):
+            self.send_response(status)
+            for k, v in headers.items():
+                if k.lower() not in ("content-length", "content-encoding", "transfer-encoding"):
+                    self.send_header(k, v)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            with stats["lock"]:
+                stats["bytes"] += len(payload)
+
+        def do_GET(self):
+            self._answer("GET")
+
+        def do_POST(self):
+            self._answer("POST")
+
+        def log_message(self, fmt, *args):
+            if os.environ.get("STANDIN_LOG"):
+                super().log_message(fmt, *args)
+
+    return Handler
+
+
+def serve(responder, port=0, faults=None, host="127.0.0.1"):
+    """Start the server in a background thread; returns (server, base_url, stats)."""
+    stats = {"requests": 0, "bytes": 0, "lock": threading.Lock()}
+    server = ThreadingHTTPServer((host, port), make_handler(responder, faults or Faults(), stats))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}", stats
+
+
+def main(argv=None):
+    env = lambda name, default: os.environ.get(f"STANDIN_{name}", default)
+    p = argparse.ArgumentParser(description="Replay a cassette as a local stand-in API.")
+    p.add_argument("cassette")
+    p.add_argument("--port", type=int, default=int(env("PORT", 8765)))
+    p.add_argument("--latency", type=float, default=float(env("LATENCY", 0)))
+    p.add_argument("--jitter", type=float, default=float(env("JITTER", 0)))
+    p.add_argument("--error-rate", type=float, default=float(env("ERROR_RATE", 0)))
+    p.add_argument("--error-status", type=int, default=int(env("ERROR_STATUS", 503)))
+    p.add_argument("--retry-after", type=int, default=env("RETRY_AFTER", None))
+    p.add_argument("--seed", type=int, default=env("SEED", None))
+    a = p.parse_args(argv)
+
+    faults = Faults(a.latency, a.jitter, a.error_rate, a.error_status, a.retry_after,
+                    None if a.seed is None else int(a.seed))
+    server, url, _ = serve(CassetteResponder(Cassette.load(a.cassette)), a.port, faults)
+    print(f"Stand-in API on {url} — export HTTP_BASE_OVERRIDE={url}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
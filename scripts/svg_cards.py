@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+svg_cards.py — every README/profile SVG card from one data load.
+
+  leetcode    solved counts + difficulty donut  (data/leetcode.json)
+  languages   LeetCode solved-per-language bars (data.json)
+  monkeytype  Monkeytype personal bests         (data.json)
+  heatmap     53-week LeetCode submission heatmap (data/lc_calendar.json)
+
+Each card is rendered in every theme to assets/<card>.svg (dark) and
+assets/<card>-light.svg. Templates are parsed once at import. A card's
+inputs are hashed; when the hash matches the previous run and the files are
+still there the card is not rendered at all, and a rendered file is only
+written when its bytes changed — so adding cards keeps both render time and
+git churn flat.
+
+  SVG_STATE   input hashes of the last render  (default ~/.cache/dashboard/svg_cards.json)
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import string
+from datetime import date, timedelta
+from html import escape
+
+import profiling
+from activity import DailySeries
+
+ASSETS     = os.environ.get("SVG_ASSETS_DIR", "assets")
+STATE_PATH = os.path.expanduser(
+    os.environ.get("SVG_STATE", "~/.cache/dashboard/svg_cards.json"))
+
+FONT = "system-ui, -apple-system, Segoe UI, Roboto, Arial"
+
+THEMES = {
+    "dark": {
+        "bg": "#0b1220", "border": "#1f2937", "title": "#f3f4f6", "label": "#cbd5e1",
+        "value": "#ffffff", "muted": "#94a3b8", "divider": "#223044", "track": "#1f2a3a",
+        "bar": "#7c6efa", "heat": ["#161b22", "#0e4429", "#006d32", "#26a641", "#39d353"],
+    },
+    "light": {
+        "bg": "#ffffff", "border": "#d0d7de", "title": "#1f2328", "label": "#424a53",
+        "value": "#1f2328", "muted": "#656d76", "divider": "#d8dee4", "track": "#eaeef2",
+        "bar": "#6554f0", "heat": ["#ebedf0", "#9be9a8", "#40c463", "#30a14e", "#216e39"],
+    },
+}
+# file suffix per theme ("" keeps assets/leetcode.svg where the README expects it)
+SUFFIX = {"dark": "", "light": "-light"}
+
+LC_COLORS = {"Easy": "#00b8a3", "Medium": "#ffc01e", "Hard": "#ff375f"}
+
+
+# ── templates ─────────────────────────────────────────────────────────────────
+_formatter = string.Formatter()
+
+
+def compile_template(src):
+    """Parse a str.format template once; returns render(**fields) -> str."""
+    parts = [(lit, field, spec) for lit, field, spec, _ in _formatter.parse(src)]
+
+    def render(**fields):
+        out = []
+        for lit, field, spec in parts:
+            out.append(lit)
+            if field is not None:
+                out.append(format(fields[field], spec))
+        return "".join(out)
+    return render
+
+
+SHELL = compile_template("""<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}">
+  <style>
+    .title {{ font: 700 20px {font}; fill: {title}; }}
+    .label {{ font: 500 14px {font}; fill: {label}; }}
+    .value {{ font: 800 22px {font}; fill: {value}; }}
+    .muted {{ font: 12px {font}; fill: {muted}; }}
+    .divider {{ stroke: {divider}; stroke-width: 1; opacity: 0.7; }}
+{style}  </style>
+  <rect x="0.5" y="0.5" width="{iw}" height="{ih}" rx="16" fill="{bg}" stroke="{border}"/>
+  <text x="24" y="42" class="title">{heading}</text>
+  <text x="24" y="66" class="muted">{subheading}</text>
+  <line x1="24" y1="84" x2="{rule}" y2="84" class="divider"/>
+{body}</svg>
+""")
+
+DONUT_STYLE = """    .seg { cursor: default; transition: filter .15s ease, opacity .15s ease; }
+    .seg:hover { filter: brightness(1.25); opacity: 0.95; }
+"""
+STAT  = compile_template('  <text x="{x}" y="120" class="label">{label}</text>\n'
+                         '  <text x="{x}" y="152" class="value">{value}</text>\n')
+SEG   = compile_template("""  <circle cx="{cx}" cy="{cy}" r="{r}" class="seg" stroke="{color}" stroke-width="{stroke}"
+          fill="none" stroke-linecap="round" stroke-dasharray="{dash} {circ}" stroke-dashoffset="{offset}">
+    <title>{label}: {count} ({pct:.1f}%) • Acceptance rate: {ar}</title>
+  </circle>
+""")
+DONUT = compile_template("""  <text x="520" y="120" class="label">Difficulty Mix</text>
+  <circle cx="{cx}" cy="{cy}" r="{r}" stroke="{track}" stroke-width="{stroke}" fill="none"/>
+{segs}  <circle cx="{cx}" cy="{cy}" r="{inner_r}" fill="{bg}"/>
+  <text x="{cx}" y="{cy_title}" text-anchor="middle" class="value" style="font-size:18px;">{total}</text>
+  <text x="{cx}" y="{cy_sub}" text-anchor="middle" class="muted">Solved</text>
+  <text x="520" y="206" class="muted">Overall acceptance rate: {overall_ar}</text>
+""")
+BAR   = compile_template("""  <text x="24" y="{ty}" class="label">{name}</text>
+  <rect x="160" y="{y}" width="{track_w}" height="12" rx="6" fill="{track}"/>
+  <rect x="160" y="{y}" width="{w:.1f}" height="12" rx="6" fill="{bar}"/>
+  <text x="{vx}" y="{ty}" class="label" text-anchor="end">{count}</text>
+""")
+PB_ROW = compile_template("""  <text x="24" y="{y}" class="label">{mode}</text>
+  <text x="180" y="{y}" class="value" style="font-size:18px;">{wpm}</text>
+  <text x="240" y="{y}" class="muted">wpm</text>
+  <text x="300" y="{y}" class="muted">acc {acc}% · raw {raw} · con {con}%</text>
+""")
+# Heatmap cells are never drawn one by one: each intensity level is a
+# pattern of grid-aligned cells, and every vertical run of same-level days is
+# a single rect filled with that pattern; identical runs in neighbouring weeks
+# widen one rect instead of adding another. A year is a couple of hundred
+# short tags instead of 371 rects with titles.
+HEAT_X, HEAT_Y, HEAT_STEP = 24, 100, 13
+HEAT_DEFS = compile_template(
+    '  <pattern id="hl{n}" x="{x}" y="{y}" width="{step}" height="{step}" patternUnits="userSpaceOnUse">'
+    '<use href="#hc" fill="{fill}"/></pattern>\n')
+HEAT_RUN  = compile_template('<rect x="{x}" y="{y}" width="{w}" height="{h}"/>')
+RUN       = re.compile(rb"(.)\1*", re.S)
+
+
+def fmt_pct(v):
+    """Format percentage number (0..100) or None -> 'N/A'."""
+    if v is None:
+        return "N/A"
+    try:
+        return f"{float(v):.0f}%"
+    except Exception:
+        return "N/A"
+
+
+def shell(theme, w, h, heading, subheading, body, style=""):
+    return SHELL(w=w, h=h, iw=w - 1, ih=h - 1, rule=w - 24, font=FONT, style=style,
+                 heading=escape(heading), subheading=escape(subheading), body=body, **theme)
+
+
+# ── cards: inputs(data) -> hashable dict | None, render(inputs, theme) -> svg ─
+def leetcode_inputs(data):
+    d = data["leetcode"]
+    if not d:
+        return None
+    solved = d.get("solved", {})
+    return {"username": d.get("username", "—"), "ranking": d.get("ranking", "—"),
+            "solved": {k: int(solved.get(k, 0) or 0) for k in ("Easy", "Medium", "Hard", "All")},
+            "acceptanceRate": d.get("acceptanceRate") or {},
+            "updated": (d.get("generatedAt") or "")[:10]}
+
+
+def leetcode_card(inp, theme):
+    solved = inp["solved"]
+    easy, medium, hard = solved["Easy"], solved["Medium"], solved["Hard"]
+    total = solved["All"] or easy + medium + hard
+    denom = max(1, easy + medium + hard)
+    ar = inp["acceptanceRate"]
+
+    # donut geometry; segments start at 12 o'clock
+    cx, cy, r, stroke = 610, 155, 42, 18
+    circ = 2 * math.pi * r
+    offset, segs = circ * 0.25, []
+    for label, count in (("Easy", easy), ("Medium", medium), ("Hard", hard)):
+        dash = circ * count / denom
+        segs.append(SEG(cx=cx, cy=cy, r=r, stroke=stroke, circ=circ, dash=dash, offset=offset,
+                        color=LC_COLORS[label], label=label, count=count,
+                        pct=count / denom * 100, ar=fmt_pct(ar.get(label))))
+        offset -= dash
+
+    body = "".join(STAT(x=x, label=label, value=value) for x, label, value in (
+        (24, "Solved", total), (180, "Easy", easy), (310, "Medium", medium), (470, "Hard", hard)))
+    body += DONUT(cx=cx, cy=cy, r=r, stroke=stroke, inner_r=r - stroke / 2, segs="".join(segs),
+                  total=total, cy_title=cy - 2, cy_sub=cy + 18,
+                  overall_ar=fmt_pct(ar.get("All")), **theme)
+    return shell(theme, 720, 220, f"LeetCode Dashboard — {inp['username']}",
+                 f"Updated: {inp['updated'] or '—'} · Rank {inp['ranking']}", body, DONUT_STYLE)
+
+
+def languages_inputs(data):
+    lc = data["dashboard"].get("leetcode") or {}
+    langs = lc.get("languages") or []
+    return {"username": lc.get("username", "—"), "languages": langs} if langs else None
+
+
+def languages_card(inp, theme):
+    langs = inp["languages"]
+    top, track_w = max(l["solved"] for l in langs) or 1, 480
+    body = "".join(BAR(ty=112 + 28 * i, y=102 + 28 * i, name=escape(l["lang"]), count=l["solved"],
+                       track_w=track_w, w=track_w * l["solved"] / top, vx=696, **theme)
+                   for i, l in enumerate(langs))
+    return shell(theme, 720, 112 + 28 * len(langs), "LeetCode Languages",
+                 f"Problems solved per language · {inp['username']}", body)
+
+
+def monkeytype_inputs(data):
+    mt = data["dashboard"].get("monkeytype") or {}
+    pbs = mt.get("personalBests") or {}
+    if not pbs:
+        return None
+    return {"username": mt.get("username", "—"), "streak": mt.get("streak", 0),
+            "completedTests": mt.get("completedTests", 0), "personalBests": pbs}
+
+
+def monkeytype_card(inp, theme):
+    pbs = sorted(inp["personalBests"].items(), key=lambda kv: -kv[1]["wpm"])
+    body = "".join(PB_ROW(y=118 + 30 * i, mode=escape(mode), **pb) for i, (mode, pb) in enumerate(pbs))
+    return shell(theme, 720, 110 + 30 * len(pbs), f"Monkeytype — {inp['username']}",
+                 f"{inp['completedTests']:,} tests · {inp['streak']} day streak", body)
+
+
+def merged_calendar(store):
+    """{epoch-seconds: count} across every year in fetch_data's calendar store."""
+    merged = {}
+    for entry in (store.get("years") or {}).values():
+        merged.update(entry.get("calendar") or {})
+    return merged
+
+
+def heatmap_inputs(data):
+    lc  = data["leetcode"]
+    cal = merged_calendar(data["calendar"])
+    if not cal:                            # no store yet: this year's calendar only
+        cal = lc.get("submissionCalendar") or {}
+        if isinstance(cal, str):
+            cal = json.loads(cal or "{}")
+    if not cal:
+        return None
+    end = (lc.get("generatedAt") or "")[:10]
+    series = DailySeries.from_calendar(cal, end=date.fromisoformat(end) if end else None)
+    first = series.end - timedelta(days=53 * 7 - 1)
+    if series.start > first:               # show empty days before the first submission
+        series.set(first, 0)
+    # the packed series is both the hash input and what the card renders from
+    return {"username": lc.get("username") or data["calendar"].get("username", "—"),
+            "series": series.to_dict()}
+
+
+def heatmap_card(inp, theme):
+    series = DailySeries.from_dict(inp["series"])
+    columns, _ = series.level_weeks()
+    runs, open_runs = [], {}               # [level, first week, weeks, row, days]
+    for wk, col in enumerate(columns):
+        still_open = {}
+        for m in RUN.finditer(col):
+            key = (col[m.start()], m.start(), m.end())
+            if key[0] == 0xFF:
+                continue
+            run = open_runs.get(key)
+            if run is None:
+                run = [key[0], wk, 0, m.start(), m.end() - m.start()]
+                runs.append(run)
+            run[2] += 1
+            still_open[key] = run
+        open_runs = still_open
+    rects = {}                             # level -> [rect, ...]
+    for level, wk, weeks, row, days in runs:
+        rects.setdefault(level, []).append(HEAT_RUN(
+            x=HEAT_X + HEAT_STEP * wk, y=HEAT_Y + HEAT_STEP * row,
+            w=HEAT_STEP * weeks - 2, h=HEAT_STEP * days - 2))
+
+    heat = theme["heat"]
+    defs = "".join(HEAT_DEFS(n=n, x=HEAT_X, y=HEAT_Y, step=HEAT_STEP, fill=fill)
+                   for n, fill in enumerate(heat))
+    width = HEAT_X * 2 + len(columns) * HEAT_STEP
+    legend_y = HEAT_Y + 7 * HEAT_STEP + 8
+    legend_x = width - HEAT_X - len(heat) * HEAT_STEP - 30
+    body = (f'  <defs>\n  <rect id="hc" width="11" height="11" rx="2"/>\n{defs}  </defs>\n'
+            + "".join(f'  <g fill="url(#hl{n})">{"".join(rs)}</g>\n'
+                      for n, rs in sorted(rects.items()))
+            + f'  <text x="{legend_x - 6}" y="{legend_y + 10}" class="muted" text-anchor="end">Less</text>\n'
+            + "".join(f'  <use href="#hc" x="{legend_x + HEAT_STEP * n}" y="{legend_y}" fill="{fill}"/>\n'
+                      for n, fill in enumerate(heat))
+            + f'  <text x="{legend_x + HEAT_STEP * len(heat) + 4}" y="{legend_y + 10}" class="muted">More</text>\n')
+    stats = series.stats()
+    return shell(theme, width, legend_y + 11 + 16,
+                 f"LeetCode Activity — {inp['username']}",
+                 f"{stats['last365']} submissions in the last year · "
+                 f"{stats['activeDays']} active days · longest streak {stats['longestStreak']} days",
+                 body)
+
+
+CARDS = {
+    "leetcode":   (leetcode_inputs,   leetcode_card),
+    "languages":  (languages_inputs,  languages_card),
+    "monkeytype": (monkeytype_inputs, monkeytype_card),
+    "heatmap":    (heatmap_inputs,    heatmap_card),
+}
+
+
+# ── incremental render ────────────────────────────────────────────────────────
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_data():
+    """The one data load every card renders from."""
+    return {"leetcode": _read_json("data/leetcode.json"),
+            "dashboard": _read_json(os.environ.get("DATA_JSON_PATH", "data.json")),
+            "calendar": _read_json(os.environ.get("LC_CALENDAR_PATH", "data/lc_calendar.json"))}
+
+
+def card_paths(name):
+    return {theme: os.path.join(ASSETS, f"{name}{SUFFIX[theme]}.svg") for theme in THEMES}
+
+
+def write_if_changed(path, text):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return True
+
+
+def render_all(data=None, force=False):
+    """Render every card whose inputs changed; returns {card: status}."""
+    if data is None:
+        with profiling.phase("parse"):
+            data = load_data()
+    state, status = _read_json(STATE_PATH), {}
+    os.makedirs(ASSETS, exist_ok=True)
+    for name, (inputs, render) in CARDS.items():
+        with profiling.phase("aggregate"):
+            inp = inputs(data)
+        if inp is None:
+            status[name] = "no data"
+            continue
+        h = hashlib.sha256(json.dumps(inp, sort_keys=True).encode()).hexdigest()
+        paths = card_paths(name)
+        if not force and state.get(name) == h and all(map(os.path.exists, paths.values())):
+            status[name] = "unchanged"
+            continue
+        wrote = []
+        for t in THEMES:
+            with profiling.phase("render"):
+                svg = render(inp, THEMES[t])
+            with profiling.phase("write"):
+                wrote.append(write_if_changed(paths[t], svg))
+        status[name] = "written" if any(wrote) else "same output"
+        state[name] = h
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    with open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    return status
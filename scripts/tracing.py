@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+tracing.py — per-request trace and Prometheus metrics for http_client.
+
+With TRACE_DIR set, every request made through http_client is recorded:
+host, endpoint label, method, status, latency, response bytes and how many
+times it was retried. On exit each script writes, into TRACE_DIR,
+
+  trace-<script>.json   every request in order
+  <script>.prom         a node_exporter textfile summary:
+                          dashboard_http_request_seconds{quantile="0.5"|"0.95"}
+                          per endpoint, bytes and retries per endpoint, and
+                          dashboard_http_errors_total per source (host)
+
+Labels name the endpoint without the user-specific parts of the URL
+("mt.results", "gh.issues", "lc.dashboard"); requests sent without one are
+labelled by method and path with numeric segments collapsed.
+
+  TRACE_DIR   where to write (unset: tracing is off and costs nothing)
+"""
+
+import atexit
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+TRACE_DIR = os.environ.get("TRACE_DIR", "")
+ENABLED   = bool(TRACE_DIR)
+
+_records = []
+_lock    = threading.Lock()
+_started = time.time()
+
+
+def default_label(method, path):
+    path = path.split("?", 1)[0]
+    return f"{method} " + re.sub(r"/\d+(?=/|$)", "/{n}", path)
+
+
+def record(host, label, method, status, seconds, nbytes, retries, error=None):
+    """Add one finished request (status None when it raised)."""
+    entry = {"t": round(time.time() - _started, 3), "host": host, "label": label,
+             "method": method, "status": status, "ms": round(seconds * 1000, 1),
+             "bytes": nbytes, "retries": retries}
+    if error:
+        entry["error"] = error
+    with _lock:
+        first = not _records
+        _records.append(entry)
+    if first:
+        atexit.register(write)
+
+
+def is_error(r):
+    return r["status"] is None or r["status"] >= 400
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(len(sorted_values) * q) - 1)]
+
+
+def _escape(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus(records, script):
+    """The textfile summary of records as a string."""
+    by_endpoint = defaultdict(list)
+    errors = defaultdict(int)
+    for r in records:
+        by_endpoint[(r["host"], r["label"])].append(r)
+        errors[r["host"]] += is_error(r)
+
+    def labels(host, label, **extra):
+        pairs = {"script": script, "host": host, "endpoint": label, **extra}
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs.items()) + "}"
+
+    lines = ["# HELP dashboard_http_request_seconds Upstream request latency.",
+             "# TYPE dashboard_http_request_seconds summary"]
+    for (host, label), rs in sorted(by_endpoint.items()):
+        secs = sorted(r["ms"] / 1000 for r in rs)
+        for q in (0.5, 0.95):
+            lines.append(f"dashboard_http_request_seconds{labels(host, label, quantile=q)} "
+                         f"{percentile(secs, q):.4f}")
+        lines.append(f"dashboard_http_request_seconds_sum{labels(host, label)} {sum(secs):.4f}")
+        lines.append(f"dashboard_http_request_seconds_count{labels(host, label)} {len(secs)}")
+    for name, key, help_ in (("response_bytes", "bytes", "Response body bytes."),
+                             ("retries", "retries", "Rate-limit retries.")):
+        lines += [f"# HELP dashboard_http_{name}_total {help_}",
+                  f"# TYPE dashboard_http_{name}_total counter"]
+        lines += [f"dashboard_http_{name}_total{labels(host, label)} {sum(r[key] for r in rs)}"
+                  for (host, label), rs in sorted(by_endpoint.items())]
+    lines += ["# HELP dashboard_http_errors_total Failed requests (status >= 400 or no response).",
+              "# TYPE dashboard_http_errors_total counter"]
+    lines += [f'dashboard_http_errors_total{{script="{_escape(script)}",source="{_escape(host)}"}} {n}'
+              for host, n in sorted(errors.items())]
+    lines += ["# HELP dashboard_trace_timestamp_seconds When this run finished.",
+              "# TYPE dashboard_trace_timestamp_seconds gauge",
+              f'dashboard_trace_timestamp_seconds{{script="{_escape(script)}"}} {time.time():.0f}']
+    return "\n".join(lines) + "\n"
+
+
+def _write(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def write():
+    """Write the trace and the textfile for this process into TRACE_DIR."""
+    with _lock:
+        records = list(_records)
+    if not ENABLED or not records:
+        return
+    script = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    started = datetime.fromtimestamp(_started, tz=timezone.utc).isoformat()
+    _write(os.path.join(TRACE_DIR, f"trace-{script}.json"),
+           json.dumps({"script": script, "startedAt": started, "requests": records}, indent=1))
+    # node_exporter reads *.prom; the atomic rename keeps it from seeing half a file
+    _write(os.path.join(TRACE_DIR, f"{script}.prom"), prometheus(records, script))
@@ -1,38 +1,32 @@
 #!/usr/bin/env python3
-import json
 import os
-import re
-import sys
 from datetime import datetime, timezone
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError
 
-START = "<!-- MONKEYTYPE:START -->"
-END = "<!-- MONKEYTYPE:END -->"
+import profiling
+import readme_sections
+from fetch_data import monkeytype_snapshot
+from http_client import HTTPError, http_get
 
 BASE = "https://api.monkeytype.com"
 APEKEY = os.environ.get("MONKEYTYPE_APE_KEY", "").strip()
+USERNAME = os.environ.get("MT_USERNAME", "theUnbeknownst")
+README_PATH = os.environ.get("README_PATH", "README.md")
 
 
 def api_get(path):
     if not APEKEY:
-        print("Missing MONKEYTYPE_APE_KEY", file=sys.stderr)
-        sys.exit(1)
+        raise RuntimeError("Missing MONKEYTYPE_APE_KEY")
 
-    req = Request(
-        f"{BASE}{path}",
-        headers={
-            "Authorization": f"bearer {APEKEY}",
-            "Accept": "application/json",
-        },
-    )
+    headers = {
+        "Authorization": f"bearer {APEKEY}",
+        "Accept": "application/json",
+    }
 
     try:
-        with urlopen(req, timeout=30) as r:
-            return json.loads(r.read().decode())
+        return http_get(f"{BASE}{path}", headers, timeout=30,
+                        label="mt" + path.split("?")[0].replace("/", "."))
     except HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"HTTP {e.code} → {body}") from e
+        raise RuntimeError(f"HTTP {e.code} → {e.body}") from e
 
 
 def seconds_to_hm(seconds):
@@ -48,16 +42,20 @@ def fmt_date(ts):
     return dt.strftime("%Y-%m-%d")
 
 
-def main():
-    stats = api_get("/users/stats")
-    streak = api_get("/users/streak")
-    last = api_get("/results/last")
-    pbs_time = api_get("/users/personalBests?mode=time")
-    pbs_words = api_get("/users/personalBests?mode=words")
-
-    s = stats.get("data", {})
-    st = streak.get("data", {})
-    lr = last.get("data", {})
+def monkeytype_block():
+    """MONKEYTYPE section body."""
+    if not APEKEY:
+        raise RuntimeError("Missing MONKEYTYPE_APE_KEY")
+
+    # Same normalized snapshot fetch_data.py uses — within its TTL this makes
+    # no API calls at all.
+    snap = monkeytype_snapshot(USERNAME, APEKEY)
+    profile = snap["profile"]
+    if not profile:
+        raise RuntimeError("Monkeytype profile unavailable")
+    s = profile.get("typingStats", {})
+    lr = snap["lastResult"] or api_get("/results/last").get("data", {})
+    mode = lr.get("name") or f"{lr.get('mode', '')} {lr.get('mode2', '')}"
 
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
 
@@ -65,8 +63,8 @@ def main():
 *Last updated:* **{now}**
 
 ### 🔥 Streak
-- Current: {st.get('length', 0)} days
-- Max: {st.get('maxLength', 0)} days
+- Current: {profile.get('streak', 0)} days
+- Max: {profile.get('maxStreak', 0)} days
 
 ### 📊 Overall Stats
 - Tests Completed: {s.get('completedTests', 0)}
@@ -76,26 +74,21 @@ def main():
 ### ⏱ Last Test
 - {lr.get('wpm', '—')} WPM
 - {lr.get('acc', '—')}% accuracy
-- Mode: {lr.get('mode', '')} {lr.get('mode2', '')}
+- Mode: {mode}
 - Date: {fmt_date(lr.get('timestamp'))}
 
 > Auto-updated via Monkeytype API
 """.strip()
+    return block
 
-    with open("README.md", "r", encoding="utf-8") as f:
-        readme = f.read()
-
-    pattern = re.compile(re.escape(START) + r".*?" + re.escape(END), re.DOTALL)
-    if not pattern.search(readme):
-        raise RuntimeError("MONKEYTYPE markers not found in README")
-
-    updated = pattern.sub(f"{START}\n{block}\n{END}", readme)
-
-    with open("README.md", "w", encoding="utf-8") as f:
-        f.write(updated)
 
+def main():
+    with profiling.phase("render"):         # its API calls count as "fetch"
+        block = monkeytype_block()
+    with profiling.phase("write"):
+        readme_sections.update(README_PATH, {"MONKEYTYPE": block})
     print("README updated successfully.")
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)